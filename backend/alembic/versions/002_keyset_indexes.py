@@ -0,0 +1,41 @@
+"""Keyset pagination indexes
+
+Revision ID: 002_keyset_indexes
+Revises: 001_initial
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002_keyset_indexes'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+# (filter columns..., sort key, id) for each paginated list endpoint.
+# match_events is already covered by uq_match_event_seq (match_id, seq).
+INDEXES = [
+    ('idx_venue_name_id', 'venues', ['name', 'id']),
+    ('idx_court_venue_name_id', 'courts', ['venue_id', 'name', 'id']),
+    ('idx_slot_court_start_id', 'slots', ['court_id', 'start_ts', 'id']),
+    ('idx_reservation_user_created_id', 'reservations', ['booked_by_user_id', 'created_at', 'id']),
+    ('idx_pt_request_status_created_id', 'pt_requests', ['status', 'created_at', 'id']),
+    ('idx_addon_status_name_id', 'addons', ['status', 'name', 'id']),
+]
+
+
+def upgrade() -> None:
+    # addons is not created by 001_initial; skip it where the table is missing
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if inspector.has_table(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in reversed(INDEXES):
+        if inspector.has_table(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,23 @@
+"""Slot availability search index
+
+Revision ID: 003_slot_availability
+Revises: 002_keyset_indexes
+Create Date: 2024-02-15 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003_slot_availability'
+down_revision = '002_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cross-venue availability search: status = 'open' AND start_ts in a window
+    op.create_index('idx_slot_status_start', 'slots', ['status', 'start_ts'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_slot_status_start', table_name='slots')
@@ -0,0 +1,56 @@
+"""Venue geohash column for geo search
+
+Revision ID: 004_venue_geohash
+Revises: 003_slot_availability
+Create Date: 2024-03-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from app.core.geo import encode, point_from_location
+
+# revision identifiers, used by Alembic.
+revision = '004_venue_geohash'
+down_revision = '003_slot_availability'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('venues', sa.Column('geohash', sa.String(12), nullable=True))
+    
+    # Backfill from location_json coordinates, keyset-batched by id
+    conn = op.get_bind()
+    venues = sa.table('venues', sa.column('id'), sa.column('location_json', postgresql.JSONB), sa.column('geohash'))
+    last_id = None
+    while True:
+        query = sa.select(venues.c.id, venues.c.location_json).order_by(venues.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(venues.c.id > last_id)
+        rows = conn.execute(query).all()
+        if not rows:
+            break
+        updates = []
+        for venue_id, location in rows:
+            point = point_from_location(location)
+            if point:
+                updates.append({"venue_id": venue_id, "geohash": encode(*point)})
+        if updates:
+            conn.execute(
+                venues.update().where(venues.c.id == sa.bindparam("venue_id")).values(geohash=sa.bindparam("geohash")),
+                updates
+            )
+        last_id = rows[-1][0]
+    
+    op.create_index(
+        'idx_venue_geohash', 'venues', ['geohash'],
+        postgresql_ops={'geohash': 'varchar_pattern_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_venue_geohash', table_name='venues')
+    op.drop_column('venues', 'geohash')
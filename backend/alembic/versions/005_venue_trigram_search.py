@@ -0,0 +1,41 @@
+"""Venue trigram search column and index
+
+Revision ID: 005_venue_trigram_search
+Revises: 004_venue_geohash
+Create Date: 2024-03-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_venue_trigram_search'
+down_revision = '004_venue_geohash'
+branch_labels = None
+depends_on = None
+
+SEARCH_TEXT_SQL = (
+    "lower(coalesce(name, '') || ' ' || coalesce(location_json->>'address', '') || ' ' "
+    "|| coalesce(location_json->>'city', ''))"
+)
+
+
+def upgrade() -> None:
+    # pg_trgm is a trusted extension (PG13+), so the database owner can create it
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    # Stored generated column - filled for existing rows when the column is added
+    op.add_column(
+        'venues',
+        sa.Column('search_text', sa.Text(), sa.Computed(SEARCH_TEXT_SQL, persisted=True))
+    )
+    op.create_index(
+        'idx_venue_search_trgm', 'venues', ['search_text'],
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_venue_search_trgm', table_name='venues')
+    op.drop_column('venues', 'search_text')
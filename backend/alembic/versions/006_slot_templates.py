@@ -0,0 +1,40 @@
+"""Weekly slot templates per court
+
+Revision ID: 006_slot_templates
+Revises: 005_venue_trigram_search
+Create Date: 2024-04-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import uuid
+
+# revision identifiers, used by Alembic.
+revision = '006_slot_templates'
+down_revision = '005_venue_trigram_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'slot_templates',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+        sa.Column('court_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('courts.id'), nullable=False),
+        sa.Column('weekday', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.Time(), nullable=False),
+        sa.Column('end_time', sa.Time(), nullable=False),
+        sa.Column('slot_minutes', sa.Integer(), nullable=False),
+        sa.Column('price_cents', sa.Integer(), nullable=False),
+        sa.Column('currency', sa.String(3), default='USD', nullable=False),
+        sa.Column('timezone', sa.String(64), default='UTC', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_unique_constraint('uq_slot_template_band', 'slot_templates', ['court_id', 'weekday', 'start_time'])
+    op.create_index('idx_slot_template_court', 'slot_templates', ['court_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_slot_template_court', table_name='slot_templates')
+    op.drop_table('slot_templates')
@@ -0,0 +1,29 @@
+"""Partial index for expiring pending reservations
+
+Revision ID: 007_reservation_pending_expiry
+Revises: 006_slot_templates
+Create Date: 2024-04-08 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_reservation_pending_expiry'
+down_revision = '006_slot_templates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only pending rows are ever scanned for expiry; status holds the enum name
+    op.create_index(
+        'idx_reservation_pending_expires',
+        'reservations',
+        ['expires_at'],
+        postgresql_where=sa.text("status = 'PENDING'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_reservation_pending_expires', table_name='reservations')
@@ -0,0 +1,30 @@
+"""Partial unique index: one paid reservation per slot
+
+Revision ID: 008_reservation_paid_slot_unique
+Revises: 007_reservation_pending_expiry
+Create Date: 2024-04-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_reservation_paid_slot_unique'
+down_revision = '007_reservation_pending_expiry'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Replaces the application-level paid-reservation checks in create_reservation
+    op.create_index(
+        'uq_reservation_paid_slot',
+        'reservations',
+        ['slot_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'PAID'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_reservation_paid_slot', table_name='reservations')
@@ -0,0 +1,31 @@
+"""Reservation carts (several slots held and paid together)
+
+Revision ID: 009_reservation_cart
+Revises: 008_reservation_paid_slot_unique
+Create Date: 2024-04-22 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009_reservation_cart'
+down_revision = '008_reservation_paid_slot_unique'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('reservations', sa.Column('cart_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_index(
+        'idx_reservation_cart',
+        'reservations',
+        ['cart_id'],
+        postgresql_where=sa.text('cart_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_reservation_cart', table_name='reservations')
+    op.drop_column('reservations', 'cart_id')
@@ -1,18 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
-from app.core.database import get_db
+from app.core.database import get_async_db, get_async_read_db
+from app.core.pagination import Keyset, PageParams
+from app.core.etag import bump_versions, conditional_get, seed_versions
 from app.api.v1.auth import get_current_user
-from app.models.user import User, UserRole
+from app.core.user_cache import Principal
+from app.core.serialization import StrId
+from app.models.user import UserRole
 from app.models.addon import Addon, AddonCategory, AddonStatus
 
 router = APIRouter()
 
+addon_keyset = Keyset(Addon.name, Addon.id)
+
 class AddonResponse(BaseModel):
-    id: str
+    id: StrId
     name: str
     description: Optional[str]
     category: str
@@ -47,32 +54,44 @@ class AddonUpdateRequest(BaseModel):
 
 @router.get("/", response_model=List[AddonResponse])
 async def list_addons(
+    request: Request,
+    response: Response,
     category: Optional[AddonCategory] = None,
     status: Optional[AddonStatus] = None,
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """List all add-ons with optional filters"""
-    query = db.query(Addon)
+    response.headers.update(await conditional_get(request, "addons"))
+    query = select(Addon)
     
     if category:
-        query = query.filter(Addon.category == category)
+        query = query.where(Addon.category == category)
     
     if status:
-        query = query.filter(Addon.status == status)
+        query = query.where(Addon.status == status)
     else:
         # By default, only show active add-ons
-        query = query.filter(Addon.status == AddonStatus.ACTIVE)
+        query = query.where(Addon.status == AddonStatus.ACTIVE)
     
-    addons = query.order_by(Addon.name).all()
+    result = await db.execute(addon_keyset.apply(query, page))
+    addons, headers = addon_keyset.page(result.scalars(), page)
+    if "ETag" not in response.headers:
+        await seed_versions("addons")
+    response.headers.update(headers)
     return addons
 
 @router.get("/{addon_id}", response_model=AddonResponse)
 async def get_addon(
     addon_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get addon details"""
-    addon = db.query(Addon).filter(Addon.id == addon_id).first()
+    response.headers.update(await conditional_get(request, f"addon:{addon_id}"))
+    result = await db.execute(select(Addon).where(Addon.id == addon_id))
+    addon = result.scalar_one_or_none()
     
     if not addon:
         raise HTTPException(
@@ -80,13 +99,15 @@ async def get_addon(
             detail="Addon not found"
         )
     
+    if "ETag" not in response.headers:
+        await seed_versions(f"addon:{addon_id}")
     return addon
 
 @router.post("/", response_model=AddonResponse, status_code=status.HTTP_201_CREATED)
 async def create_addon(
     request: AddonCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new addon (admin only)"""
     if current_user.role != UserRole.SUPER_ADMIN:
@@ -96,7 +117,8 @@ async def create_addon(
         )
     
     # Check if addon with same name exists
-    existing = db.query(Addon).filter(Addon.name == request.name).first()
+    result = await db.execute(select(Addon.id).where(Addon.name == request.name))
+    existing = result.scalar_one_or_none()
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -115,8 +137,9 @@ async def create_addon(
     )
     
     db.add(addon)
-    db.commit()
-    db.refresh(addon)
+    await db.commit()
+    await db.refresh(addon)
+    await bump_versions("addons", f"addon:{addon.id}")
     
     return addon
 
@@ -124,8 +147,8 @@ async def create_addon(
 async def update_addon(
     addon_id: UUID,
     request: AddonUpdateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update addon (admin only)"""
     if current_user.role != UserRole.SUPER_ADMIN:
@@ -134,7 +157,8 @@ async def update_addon(
             detail="Only admins can update addons"
         )
     
-    addon = db.query(Addon).filter(Addon.id == addon_id).first()
+    result = await db.execute(select(Addon).where(Addon.id == addon_id))
+    addon = result.scalar_one_or_none()
     
     if not addon:
         raise HTTPException(
@@ -145,10 +169,13 @@ async def update_addon(
     # Update fields
     if request.name is not None:
         # Check if name is already taken by another addon
-        existing = db.query(Addon).filter(
-            Addon.name == request.name,
-            Addon.id != addon_id
-        ).first()
+        result = await db.execute(
+            select(Addon.id).where(
+                Addon.name == request.name,
+                Addon.id != addon_id
+            )
+        )
+        existing = result.scalar_one_or_none()
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -171,8 +198,9 @@ async def update_addon(
     if request.metadata_json is not None:
         addon.metadata_json = request.metadata_json
     
-    db.commit()
-    db.refresh(addon)
+    await db.commit()
+    await db.refresh(addon)
+    await bump_versions("addons", f"addon:{addon.id}")
     
     return addon
 
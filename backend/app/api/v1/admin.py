@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.api.v1.auth import get_current_user
+from app.core.user_cache import Principal, invalidate_user
 from app.models.user import User, UserRole
 from app.models.ad import AdCreative, AdCreativeStatus
 
@@ -13,11 +15,14 @@ router = APIRouter()
 class RejectRequest(BaseModel):
     reason: str
 
+class RoleUpdateRequest(BaseModel):
+    role: UserRole
+
 @router.post("/ad-creatives/{creative_id}/approve")
 async def approve_ad_creative(
     creative_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Approve an ad creative (super admin only)"""
     if current_user.role != UserRole.SUPER_ADMIN:
@@ -26,7 +31,8 @@ async def approve_ad_creative(
             detail="Only super admin can approve ads"
         )
     
-    creative = db.query(AdCreative).filter(AdCreative.id == creative_id).first()
+    result = await db.execute(select(AdCreative).where(AdCreative.id == creative_id))
+    creative = result.scalar_one_or_none()
     if not creative:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -37,7 +43,7 @@ async def approve_ad_creative(
     creative.decided_by_user_id = current_user.id
     creative.decided_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     return {"status": "approved", "creative_id": str(creative_id)}
 
@@ -45,8 +51,8 @@ async def approve_ad_creative(
 async def reject_ad_creative(
     creative_id: UUID,
     request: RejectRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reject an ad creative (super admin only)"""
     if current_user.role != UserRole.SUPER_ADMIN:
@@ -55,7 +61,8 @@ async def reject_ad_creative(
             detail="Only super admin can reject ads"
         )
     
-    creative = db.query(AdCreative).filter(AdCreative.id == creative_id).first()
+    result = await db.execute(select(AdCreative).where(AdCreative.id == creative_id))
+    creative = result.scalar_one_or_none()
     if not creative:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -67,15 +74,15 @@ async def reject_ad_creative(
     creative.decided_at = datetime.utcnow()
     creative.rejection_reason = request.reason
     
-    db.commit()
+    await db.commit()
     
     return {"status": "rejected", "creative_id": str(creative_id)}
 
 @router.post("/ad-creatives/{creative_id}/revoke")
 async def revoke_ad_creative(
     creative_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Revoke an approved ad creative (super admin only)"""
     if current_user.role != UserRole.SUPER_ADMIN:
@@ -84,7 +91,8 @@ async def revoke_ad_creative(
             detail="Only super admin can revoke ads"
         )
     
-    creative = db.query(AdCreative).filter(AdCreative.id == creative_id).first()
+    result = await db.execute(select(AdCreative).where(AdCreative.id == creative_id))
+    creative = result.scalar_one_or_none()
     if not creative:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -98,7 +106,35 @@ async def revoke_ad_creative(
     # All placements with this creative will be disabled
     # (handled by application logic when rendering)
     
-    db.commit()
+    await db.commit()
     
     return {"status": "revoked", "creative_id": str(creative_id)}
 
+@router.patch("/users/{user_id}/role")
+async def update_user_role(
+    user_id: UUID,
+    request: RoleUpdateRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Change a user's role (super admin only)"""
+    if current_user.role != UserRole.SUPER_ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only super admin can change roles"
+        )
+    
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    user.role = request.role
+    await db.commit()
+    # The role is part of the cached principal - drop it in every worker
+    await invalidate_user(user_id)
+    
+    return {"status": "updated", "user_id": str(user_id), "role": request.role.value}
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List
 from uuid import UUID
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.api.v1.auth import get_current_user
-from app.models.user import User
+from app.core.user_cache import Principal
 from app.models.ad import Advertiser, AdCreative, AdPlacement, AdCreativeStatus, AdPlacementSlot
 
 router = APIRouter()
@@ -23,11 +24,12 @@ class AdPlacementCreateRequest(BaseModel):
 @router.post("/creatives/submit", status_code=status.HTTP_201_CREATED)
 async def submit_ad_creative(
     request: AdCreativeSubmitRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit an ad creative for approval"""
-    advertiser = db.query(Advertiser).filter(Advertiser.id == request.advertiser_id).first()
+    result = await db.execute(select(Advertiser).where(Advertiser.id == request.advertiser_id))
+    advertiser = result.scalar_one_or_none()
     if not advertiser:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -42,19 +44,20 @@ async def submit_ad_creative(
     )
     
     db.add(creative)
-    db.commit()
-    db.refresh(creative)
+    await db.commit()
+    await db.refresh(creative)
     
     return {"creative_id": str(creative.id), "status": "submitted"}
 
 @router.post("/placements", status_code=status.HTTP_201_CREATED)
 async def create_ad_placement(
     request: AdPlacementCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create an ad placement (only approved creatives)"""
-    creative = db.query(AdCreative).filter(AdCreative.id == request.creative_id).first()
+    result = await db.execute(select(AdCreative).where(AdCreative.id == request.creative_id))
+    creative = result.scalar_one_or_none()
     if not creative:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -74,8 +77,8 @@ async def create_ad_placement(
     )
     
     db.add(placement)
-    db.commit()
-    db.refresh(placement)
+    await db.commit()
+    await db.refresh(placement)
     
     return {"placement_id": str(placement.id), "status": "scheduled"}
 
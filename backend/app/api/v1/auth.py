@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 from uuid import UUID
-from app.core.database import get_db
-from app.core.redis_client import get_redis
+from app.core.database import get_async_db
+from app.core.redis_client import get_async_redis
 from app.core.security import create_access_token, generate_otp, decode_access_token
+from app.core.user_cache import Principal, get_principal, invalidate_user
 from app.models.user import User
 from datetime import timedelta
 from app.core.config import settings
@@ -31,9 +33,9 @@ class AuthResponse(BaseModel):
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Get current authenticated user (cached snapshot - id, role, verified flags)"""
     token = credentials.credentials
     payload = decode_access_token(token)
     if payload is None:
@@ -54,7 +56,20 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid user ID in token"
         )
-    user = db.query(User).filter(User.id == user_id).first()
+    principal = await get_principal(user_id, db)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return principal
+
+async def get_current_user_model(
+    principal: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get current authenticated user as a full ORM User (always hits the database)"""
+    user = await db.get(User, principal.id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -65,8 +80,8 @@ async def get_current_user(
 @router.post("/start")
 async def auth_start(
     request: AuthStartRequest,
-    db: Session = Depends(get_db),
-    redis = Depends(get_redis)
+    db: AsyncSession = Depends(get_async_db),
+    redis = Depends(get_async_redis)
 ):
     """Start authentication - send OTP"""
     if not request.phone and not request.email:
@@ -79,7 +94,7 @@ async def auth_start(
     otp = generate_otp()
     
     # Store OTP in Redis with 10 minute expiry
-    redis.setex(f"otp:{identifier}", 600, otp)
+    await redis.setex(f"otp:{identifier}", 600, otp)
     
     # In development, log OTP for testing
     if settings.is_development:
@@ -94,7 +109,7 @@ async def auth_start(
 @router.post("/dev-otp")
 async def dev_get_otp(
     request: AuthStartRequest,
-    redis = Depends(get_redis)
+    redis = Depends(get_async_redis)
 ):
     """Development endpoint to get OTP (only in dev mode)"""
     if settings.is_production:
@@ -110,7 +125,7 @@ async def dev_get_otp(
         )
     
     identifier = request.phone or request.email
-    otp = redis.get(f"otp:{identifier}")
+    otp = await redis.get(f"otp:{identifier}")
     
     if not otp:
         raise HTTPException(
@@ -123,8 +138,8 @@ async def dev_get_otp(
 @router.post("/verify")
 async def auth_verify(
     request: AuthVerifyRequest,
-    db: Session = Depends(get_db),
-    redis = Depends(get_redis)
+    db: AsyncSession = Depends(get_async_db),
+    redis = Depends(get_async_redis)
 ):
     """Verify OTP and return JWT token"""
     if not request.phone and not request.email:
@@ -134,7 +149,7 @@ async def auth_verify(
         )
     
     identifier = request.phone or request.email
-    stored_otp = redis.get(f"otp:{identifier}")
+    stored_otp = await redis.get(f"otp:{identifier}")
     
     if not stored_otp or stored_otp != request.otp:
         raise HTTPException(
@@ -144,28 +159,32 @@ async def auth_verify(
     
     # Get or create user
     if request.phone:
-        user = db.query(User).filter(User.phone == request.phone).first()
+        result = await db.execute(select(User).where(User.phone == request.phone))
+        user = result.scalar_one_or_none()
         if not user:
             user = User(phone=request.phone, name="", verified_phone=True)
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
         else:
             user.verified_phone = True
-            db.commit()
+            await db.commit()
+            await invalidate_user(user.id)
     else:
-        user = db.query(User).filter(User.email == request.email).first()
+        result = await db.execute(select(User).where(User.email == request.email))
+        user = result.scalar_one_or_none()
         if not user:
             user = User(email=request.email, name="", verified_email=True)
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
         else:
             user.verified_email = True
-            db.commit()
+            await db.commit()
+            await invalidate_user(user.id)
     
     # Delete OTP
-    redis.delete(f"otp:{identifier}")
+    await redis.delete(f"otp:{identifier}")
     
     # Create access token
     access_token = create_access_token(
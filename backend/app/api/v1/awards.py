@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List
 from uuid import UUID
 from datetime import datetime
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.api.v1.auth import get_current_user
-from app.models.user import User
+from app.core.user_cache import Principal
+from app.core.serialization import StrId
 from app.models.match import Match
 from app.models.award import MatchAward, AwardKind
 
@@ -17,8 +19,8 @@ class AwardCreateRequest(BaseModel):
     winner_ref: str  # player_id or event_id
 
 class AwardResponse(BaseModel):
-    id: str
-    match_id: str
+    id: StrId
+    match_id: StrId
     kind: str
     winner_ref: str
     decided_at: datetime
@@ -30,11 +32,12 @@ class AwardResponse(BaseModel):
 async def create_award(
     match_id: UUID,
     request: AwardCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create an award for a match"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    result = await db.execute(select(Match).where(Match.id == match_id))
+    match = result.scalar_one_or_none()
     if not match:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -42,10 +45,13 @@ async def create_award(
         )
     
     # Check if award of this kind already exists
-    existing = db.query(MatchAward).filter(
-        MatchAward.match_id == match_id,
-        MatchAward.kind == request.kind
-    ).first()
+    result = await db.execute(
+        select(MatchAward.id).where(
+            MatchAward.match_id == match_id,
+            MatchAward.kind == request.kind
+        )
+    )
+    existing = result.scalar_one_or_none()
     
     if existing:
         raise HTTPException(
@@ -61,20 +67,20 @@ async def create_award(
     )
     
     db.add(award)
-    db.commit()
-    db.refresh(award)
+    await db.commit()
+    await db.refresh(award)
     
     return award
 
 @router.get("/matches/{match_id}/awards", response_model=List[AwardResponse])
 async def get_match_awards(
     match_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all awards for a match"""
-    awards = db.query(MatchAward).filter(
-        MatchAward.match_id == match_id
-    ).all()
+    result = await db.execute(
+        select(MatchAward).where(MatchAward.match_id == match_id)
+    )
     
-    return awards
+    return result.scalars().all()
 
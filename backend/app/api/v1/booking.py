@@ -1,30 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, insert, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-from uuid import UUID
-from app.core.database import get_db
+from uuid import UUID, uuid4
+from app.core.database import get_async_db, get_async_read_db
 from app.api.v1.auth import get_current_user
-from app.models.user import User
+from app.core.user_cache import Principal
 from app.models.venue import Venue, Court, Slot, SlotStatus
 from app.models.booking import Reservation, ReservationStatus, ActorType
 from app.core.config import settings
+from app.core.serialization import RowSerializer, json_default, StrId
+from app.core.pagination import Keyset, PageParams
+from app.core.etag import conditional_get, seed_versions
+from app.core.holds import start_hold
+from app.core.availability import mark_slots, open_slot_counts
+from app.core.geo import cell_size_km, covering_precision, distance_km_sql, neighborhood
+import orjson
 
 router = APIRouter()
 
 class VenueResponse(BaseModel):
-    id: str
+    id: StrId
     name: str
     location_json: dict
-    owner_user_id: str
+    owner_user_id: StrId
     
     class Config:
         from_attributes = True
 
+class NearbyVenueResponse(VenueResponse):
+    distance_km: float
+
+class VenueSearchResponse(VenueResponse):
+    score: float
+
 class CourtResponse(BaseModel):
-    id: str
-    venue_id: str
+    id: StrId
+    venue_id: StrId
     name: str
     sport: str
     attributes_json: dict
@@ -33,8 +47,8 @@ class CourtResponse(BaseModel):
         from_attributes = True
 
 class SlotResponse(BaseModel):
-    id: str
-    court_id: str
+    id: StrId
+    court_id: StrId
     start_ts: datetime
     end_ts: datetime
     price_cents: int
@@ -44,6 +58,29 @@ class SlotResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class AvailableSlot(BaseModel):
+    id: str
+    start_ts: datetime
+    end_ts: datetime
+    price_cents: int
+    currency: str
+
+class CourtAvailability(BaseModel):
+    court_id: str
+    court_name: str
+    slots: List[AvailableSlot]
+
+class VenueAvailability(BaseModel):
+    venue_id: str
+    venue_name: str
+    courts: List[CourtAvailability]
+
+# Fast JSON paths - same shape as the response models above
+venue_serializer = RowSerializer(Venue.id, Venue.name, Venue.location_json, Venue.owner_user_id)
+slot_serializer = RowSerializer(
+    Slot.id, Slot.court_id, Slot.start_ts, Slot.end_ts, Slot.price_cents, Slot.currency, Slot.status
+)
+
 class ReservationCreateRequest(BaseModel):
     slot_id: Optional[UUID] = None  # Nullable for own court option
     actor_type: ActorType
@@ -52,9 +89,9 @@ class ReservationCreateRequest(BaseModel):
     custom_venue_json: Optional[Dict[str, Any]] = None
 
 class ReservationResponse(BaseModel):
-    id: str
-    slot_id: Optional[str] = None
-    booked_by_user_id: str
+    id: StrId
+    slot_id: Optional[StrId] = None
+    booked_by_user_id: StrId
     actor_type: str
     status: str
     is_recurring: bool
@@ -62,45 +99,207 @@ class ReservationResponse(BaseModel):
     recurrence_end_date: Optional[datetime] = None
     use_own_court: bool
     custom_venue_json: Optional[Dict[str, Any]] = None
+    cart_id: Optional[StrId] = None
     expires_at: Optional[datetime] = None
     created_at: datetime
     
     class Config:
         from_attributes = True
 
+class CartCreateRequest(BaseModel):
+    slot_ids: List[UUID] = Field(..., min_length=1, max_length=settings.CART_MAX_SLOTS)
+    actor_type: ActorType
+    actor_id: Optional[str] = None
+
+class CartResponse(BaseModel):
+    cart_id: str
+    total_cents: int
+    currency: str
+    expires_at: datetime
+    reservations: List[ReservationResponse]
+
+reservation_serializer = RowSerializer(
+    Reservation.id, Reservation.slot_id, Reservation.booked_by_user_id, Reservation.actor_type,
+    Reservation.status, Reservation.is_recurring, Reservation.recurrence_pattern,
+    Reservation.recurrence_end_date, Reservation.use_own_court, Reservation.custom_venue_json,
+    Reservation.cart_id, Reservation.expires_at, Reservation.created_at
+)
+
+def hold_slot_statement(slot_id: UUID, values: Dict[str, Any]):
+    """Claim an OPEN slot and insert its pending reservation in a single statement.
+
+    Yields one row - the reservation_serializer columns plus the slot's court_id and
+    start_ts - or no row when the slot is missing or not OPEN. A second paid
+    reservation for a slot is rejected by uq_reservation_paid_slot.
+    """
+    slots, reservations = Slot.__table__, Reservation.__table__
+    claimed = update(slots).where(
+        slots.c.id == slot_id,
+        slots.c.status == SlotStatus.OPEN
+    ).values(status=SlotStatus.HELD).returning(
+        slots.c.id, slots.c.court_id, slots.c.start_ts
+    ).cte("claimed")
+    inserted = insert(reservations).from_select(
+        ["slot_id", *values],
+        select(claimed.c.id, *(literal(value, reservations.c[name].type) for name, value in values.items()))
+    ).returning(*(reservations.c[field] for field in reservation_serializer.fields)).cte("inserted")
+    return select(
+        *(inserted.c[field] for field in reservation_serializer.fields),
+        claimed.c.court_id,
+        claimed.c.start_ts
+    ).select_from(inserted.join(claimed, inserted.c.slot_id == claimed.c.id))
+
+# Cross-venue search rows, flattened; grouped by venue/court after paging
+availability_serializer = RowSerializer(
+    Venue.id.label("venue_id"), Venue.name.label("venue_name"),
+    Court.id.label("court_id"), Court.name.label("court_name"),
+    Slot.id, Slot.start_ts, Slot.end_ts, Slot.price_cents, Slot.currency
+)
+
+# Keyset orderings - each backed by a composite index (see 002_keyset_indexes)
+venue_keyset = Keyset(Venue.name, Venue.id)
+court_keyset = Keyset(Court.name, Court.id)
+slot_keyset = Keyset(Slot.start_ts, Slot.id)
+reservation_keyset = Keyset(Reservation.created_at, Reservation.id, descending=True)
+availability_keyset = Keyset(Slot.start_ts, Slot.id)
+
+def like_pattern(term: str) -> str:
+    """%term% for ILIKE with the user's own wildcards escaped"""
+    escaped = term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def group_availability(rows) -> list:
+    """Nest flat slot rows under their venue and court, keeping the row order"""
+    venues = {}
+    for row in rows:
+        venue = venues.get(row.venue_id)
+        if venue is None:
+            venue = venues[row.venue_id] = {"venue_id": row.venue_id, "venue_name": row.venue_name, "courts": {}}
+        court = venue["courts"].get(row.court_id)
+        if court is None:
+            court = venue["courts"][row.court_id] = {"court_id": row.court_id, "court_name": row.court_name, "slots": []}
+        court["slots"].append({
+            "id": row.id,
+            "start_ts": row.start_ts,
+            "end_ts": row.end_ts,
+            "price_cents": row.price_cents,
+            "currency": row.currency
+        })
+    for venue in venues.values():
+        venue["courts"] = list(venue["courts"].values())
+    return list(venues.values())
+
 @router.get("/", response_model=List[VenueResponse])
 async def list_venues(
+    request: Request,
     sport: Optional[str] = None,
     location: Optional[str] = None,
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """List venues with optional filters"""
-    query = db.query(Venue)
+    # A sport filter reads courts too, so court writes must invalidate it
+    scopes = ("venues", "courts") if sport else ("venues",)
+    cache_headers = await conditional_get(request, *scopes)
+    query = venue_serializer.select()
     
     if sport:
         # Filter by courts with matching sport
-        query = query.join(Court).filter(Court.sport == sport)
+        query = query.join(Court).where(Court.sport == sport)
     
     if location:
-        # Simple location filter (can be enhanced with geospatial queries)
-        query = query.filter(Venue.location_json["address"].astext.ilike(f"%{location}%"))
+        # Substring match on name/address/city - served by the trigram index
+        query = query.where(Venue.search_text.ilike(like_pattern(location), escape="\\"))
+    
+    result = await db.execute(venue_keyset.apply(query.distinct(), page))
+    rows, headers = venue_keyset.page(result, page)
+    if "ETag" not in cache_headers:
+        await seed_versions(*scopes)
+    return venue_serializer.response(rows, headers={**cache_headers, **headers})
+
+async def _venues_within(db: AsyncSession, lat: float, lng: float, radius_km: float, limit: int, sport: Optional[str]):
+    """Venues within radius_km ordered by distance: geohash prefix scan, then exact haversine"""
+    distance = distance_km_sql(Venue.location_json, lat, lng)
+    serializer = RowSerializer(*venue_serializer.columns, distance.label("distance_km"))
+    query = serializer.select().where(distance <= radius_km)
+    
+    precision = covering_precision(lat, radius_km)
+    if precision is not None:
+        # idx_venue_geohash (varchar_pattern_ops) serves the prefix LIKEs
+        query = query.where(or_(*[Venue.geohash.like(f"{cell}%") for cell in neighborhood(lat, lng, precision)]))
+    else:
+        query = query.where(Venue.geohash.isnot(None))
+    if sport:
+        query = query.where(Venue.id.in_(select(Court.venue_id).where(Court.sport == sport)))
+    
+    result = await db.execute(query.order_by(distance, Venue.id).limit(limit))
+    return serializer, result.all()
+
+@router.get("/nearby", response_model=List[NearbyVenueResponse])
+async def nearby_venues(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0, le=settings.GEO_MAX_RADIUS_KM),
+    limit: int = Query(20, ge=1, le=100),
+    sport: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Venues near a point, nearest first - within radius_km, or the nearest `limit` when no radius is given"""
+    if radius_km is not None:
+        serializer, rows = await _venues_within(db, lat, lng, radius_km, limit, sport)
+        return serializer.response(rows)
+    
+    # Nearest-N: widen the search one geohash level at a time until the covered
+    # radius holds `limit` venues (anything closer is guaranteed to be inside it)
+    for precision in range(6, 0, -1):
+        covered_km = min(cell_size_km(precision, lat), settings.GEO_MAX_RADIUS_KM)
+        serializer, rows = await _venues_within(db, lat, lng, covered_km, limit, sport)
+        if len(rows) >= limit or covered_km >= settings.GEO_MAX_RADIUS_KM:
+            break
+    return serializer.response(rows)
+
+@router.get("/search", response_model=List[VenueSearchResponse])
+async def search_venues(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Search venues by name, address and city, best match first (typo tolerant)"""
+    term = q.strip().lower()
+    score = func.word_similarity(term, Venue.search_text)
+    serializer = RowSerializer(*venue_serializer.columns, score.label("score"))
     
-    venues = query.distinct().all()
-    return venues
+    # Substring hits plus fuzzy word matches (search_text %> term); both use idx_venue_search_trgm
+    query = serializer.select().where(or_(
+        Venue.search_text.ilike(like_pattern(term), escape="\\"),
+        Venue.search_text.op("%>")(term)
+    )).order_by(score.desc(), Venue.name, Venue.id).limit(limit)
+    
+    result = await db.execute(query)
+    return serializer.response(result)
 
 @router.get("/{venue_id}/courts", response_model=List[CourtResponse])
 async def list_courts(
     venue_id: UUID,
+    request: Request,
+    response: Response,
     sport: Optional[str] = None,
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """List courts for a venue"""
-    query = db.query(Court).filter(Court.venue_id == venue_id)
+    response.headers.update(await conditional_get(request, f"venue:{venue_id}"))
+    query = select(Court).where(Court.venue_id == venue_id)
     
     if sport:
-        query = query.filter(Court.sport == sport)
+        query = query.where(Court.sport == sport)
     
-    courts = query.all()
+    result = await db.execute(court_keyset.apply(query, page))
+    courts, headers = court_keyset.page(result.scalars(), page)
+    if courts and "ETag" not in response.headers:
+        # Only venues that turned out to have courts get a version key
+        await seed_versions(f"venue:{venue_id}")
+    response.headers.update(headers)
     return courts
 
 @router.get("/courts/{court_id}/slots", response_model=List[SlotResponse])
@@ -108,27 +307,125 @@ async def list_slots(
     court_id: UUID,
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None,
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """List available slots for a court"""
-    query = db.query(Slot).filter(Slot.court_id == court_id)
+    query = slot_serializer.select().where(Slot.court_id == court_id)
     
     if from_date:
-        query = query.filter(Slot.start_ts >= from_date)
+        query = query.where(Slot.start_ts >= from_date)
     if to_date:
-        query = query.filter(Slot.end_ts <= to_date)
+        query = query.where(Slot.end_ts <= to_date)
     
     # Only show open or held slots (held will expire if not paid)
-    query = query.filter(Slot.status.in_([SlotStatus.OPEN, SlotStatus.HELD]))
+    query = query.where(Slot.status.in_([SlotStatus.OPEN, SlotStatus.HELD]))
+    
+    result = await db.execute(slot_keyset.apply(query, page))
+    rows, headers = slot_keyset.page(result, page)
+    return slot_serializer.response(rows, headers=headers)
+
+@router.get("/availability", response_model=List[VenueAvailability])
+async def search_availability(
+    sport: str,
+    start: datetime,
+    end: datetime,
+    max_price_cents: Optional[int] = None,
+    location: Optional[str] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Open slots across all venues for a sport and time window, grouped by venue and court"""
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be after start"
+        )
+    if end - start > timedelta(days=settings.AVAILABILITY_SEARCH_MAX_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search window cannot exceed {settings.AVAILABILITY_SEARCH_MAX_DAYS} days"
+        )
+    
+    # One set-based query: idx_slot_status_start drives the window scan, courts.sport filters the join
+    query = availability_serializer.select().select_from(Slot).join(
+        Court, Slot.court_id == Court.id
+    ).join(
+        Venue, Court.venue_id == Venue.id
+    ).where(
+        Slot.status == SlotStatus.OPEN,
+        Slot.start_ts >= start,
+        Slot.end_ts <= end,
+        Court.sport == sport
+    )
+    
+    if max_price_cents is not None:
+        query = query.where(Slot.price_cents <= max_price_cents)
+    if location:
+        query = query.where(Venue.search_text.ilike(like_pattern(location), escape="\\"))
+    
+    # Earliest first, ties broken by slot id - stable across pages
+    result = await db.execute(availability_keyset.apply(query, page))
+    rows, headers = availability_keyset.page(result, page)
+    return Response(
+        content=orjson.dumps(group_availability(rows), default=json_default),
+        headers=headers,
+        media_type="application/json"
+    )
+
+@router.get("/{venue_id}/availability")
+async def venue_availability(
+    venue_id: UUID,
+    start: datetime,
+    end: datetime,
+    sport: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Whether a venue has open slots starting in a window, per court (from the availability index)"""
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be after start"
+        )
+    if end - start > timedelta(days=settings.AVAILABILITY_SEARCH_MAX_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search window cannot exceed {settings.AVAILABILITY_SEARCH_MAX_DAYS} days"
+        )
+    
+    query = select(Court.id).where(Court.venue_id == venue_id)
+    if sport:
+        query = query.where(Court.sport == sport)
+    court_ids = (await db.execute(query)).scalars().all()
+    
+    counts = await open_slot_counts(court_ids, start, end) if court_ids else {}
+    source = "index"
+    if counts is None:
+        # Window or court-days not indexed (or evicted), or Redis unavailable - count from the slots table
+        source = "database"
+        result = await db.execute(
+            select(Slot.court_id, func.count()).where(
+                Slot.court_id.in_(court_ids),
+                Slot.status == SlotStatus.OPEN,
+                Slot.start_ts >= start,
+                Slot.start_ts < end
+            ).group_by(Slot.court_id)
+        )
+        counts = {court_id: 0 for court_id in court_ids}
+        counts.update(dict(result.all()))
     
-    slots = query.order_by(Slot.start_ts).all()
-    return slots
+    return {
+        "venue_id": str(venue_id),
+        "available": any(counts.values()),
+        "open_slots_by_court": {str(court_id): count for court_id, count in counts.items()},
+        "source": source
+    }
 
 @router.post("/reservations", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
 async def create_reservation(
     request: ReservationCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a reservation with hold TTL"""
     # Validate court selection
@@ -144,105 +441,174 @@ async def create_reservation(
             detail="custom_venue_json is required when use_own_court is True"
         )
     
-    # Get slot and verify it's available (if not using own court)
-    slot = None
-    slot_price_cents = None
-    if not request.use_own_court and request.slot_id:
-        slot = db.query(Slot).filter(Slot.id == request.slot_id).first()
-        if not slot:
+    expires_at = datetime.utcnow() + timedelta(minutes=settings.HOLD_TTL_MINUTES)
+    
+    if request.use_own_court:
+        reservation = Reservation(
+            booked_by_user_id=current_user.id,
+            actor_type=request.actor_type,
+            actor_id=request.actor_id,
+            status=ReservationStatus.PENDING,
+            expires_at=expires_at,
+            use_own_court=True,
+            custom_venue_json=request.custom_venue_json
+        )
+        try:
+            db.add(reservation)
+            await db.commit()
+            await db.refresh(reservation)
+        except Exception as e:
+            await db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Slot not found"
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error creating reservation: {str(e)}"
             )
-        slot_price_cents = slot.price_cents
-    
-    # Handle slot-based reservation (with locking for race condition prevention)
-    if not request.use_own_court and request.slot_id:
-        # Check if there's already a paid reservation for this slot
-        existing_paid = db.query(Reservation).filter(
-            Reservation.slot_id == request.slot_id,
-            Reservation.status == ReservationStatus.PAID
-        ).first()
-        
-        if existing_paid:
+        await start_hold(expires_at, reservation.id)
+        return reservation
+    
+    # Slot-based: claim the slot and insert the reservation in one statement
+    try:
+        result = await db.execute(hold_slot_statement(request.slot_id, {
+            "id": uuid4(),
+            "booked_by_user_id": current_user.id,
+            "actor_type": request.actor_type,
+            "actor_id": request.actor_id,
+            "status": ReservationStatus.PENDING,
+            "expires_at": expires_at,
+            "is_recurring": False,
+            "use_own_court": False,
+            "custom_venue_json": request.custom_venue_json,
+        }))
+        row = result.first()
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating reservation: {str(e)}"
+        )
+    
+    if row is None:
+        # Cold path: tell a missing slot apart from a taken one
+        result = await db.execute(select(Slot.id).where(Slot.id == request.slot_id))
+        if result.scalar_one_or_none() is None:
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Slot is already booked"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Slot not found"
             )
-        
-        # Use SELECT FOR UPDATE to prevent race conditions
-        from sqlalchemy import select
-        from sqlalchemy.orm import with_for_update
-        
-        # Lock the slot row for update to prevent concurrent modifications
-        slot = db.query(Slot).with_for_update().filter(Slot.id == request.slot_id).first()
-        
-        if not slot:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Slot is not available"
+        )
+    
+    reservation = row[:len(reservation_serializer.fields)]
+    await mark_slots([(row.court_id, row.start_ts)], available=False)
+    await start_hold(expires_at, row.id)
+    return reservation_serializer.one_response(reservation, status_code=status.HTTP_201_CREATED)
+
+@router.post("/reservations/cart", response_model=CartResponse, status_code=status.HTTP_201_CREATED)
+async def create_cart_reservation(
+    request: CartCreateRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Hold several slots at once - all or nothing - to be paid with one payment"""
+    slot_ids = sorted(set(request.slot_ids))
+    if len(slot_ids) != len(request.slot_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate slot in cart"
+        )
+    
+    cart_id = uuid4()
+    expires_at = datetime.utcnow() + timedelta(minutes=settings.HOLD_TTL_MINUTES)
+    try:
+        # Lock in slot id order: concurrent carts over overlapping slots queue up
+        # behind each other instead of deadlocking
+        result = await db.execute(
+            select(Slot.id, Slot.status, Slot.court_id, Slot.start_ts, Slot.price_cents, Slot.currency).where(
+                Slot.id.in_(slot_ids)
+            ).order_by(Slot.id).with_for_update()
+        )
+        slots = result.all()
+        if len(slots) != len(slot_ids):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Slot not found"
             )
-        
-        # Re-check paid reservation after lock
-        existing_paid = db.query(Reservation).filter(
-            Reservation.slot_id == request.slot_id,
-            Reservation.status == ReservationStatus.PAID
-        ).first()
-        
-        if existing_paid:
+        if any(slot.status != SlotStatus.OPEN for slot in slots):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
-                detail="Slot is already booked"
+                detail="Slot is not available"
             )
-        
-        # Transaction: check and update slot status
-        if slot.status != SlotStatus.OPEN:
+        currencies = {slot.currency for slot in slots}
+        if len(currencies) != 1:
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Slot is not available"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="All slots in a cart must share a currency"
             )
         
-        # Set slot to HELD
-        slot.status = SlotStatus.HELD
-    
-    expires_at = datetime.utcnow() + timedelta(minutes=settings.HOLD_TTL_MINUTES)
-    
-    reservation = Reservation(
-        slot_id=request.slot_id,
-        booked_by_user_id=current_user.id,
-        actor_type=request.actor_type,
-        actor_id=request.actor_id,
-        status=ReservationStatus.PENDING,
-        expires_at=expires_at,
-        use_own_court=request.use_own_court,
-        custom_venue_json=request.custom_venue_json
-    )
-    
-    try:
-        db.add(reservation)
-        db.commit()
-        db.refresh(reservation)
-        return reservation
+        await db.execute(
+            update(Slot).where(Slot.id.in_(slot_ids)).values(status=SlotStatus.HELD).execution_options(synchronize_session=False)
+        )
+        result = await db.execute(
+            insert(Reservation.__table__).values([
+                {
+                    "id": uuid4(),
+                    "slot_id": slot.id,
+                    "booked_by_user_id": current_user.id,
+                    "actor_type": request.actor_type,
+                    "actor_id": request.actor_id,
+                    "status": ReservationStatus.PENDING,
+                    "expires_at": expires_at,
+                    "is_recurring": False,
+                    "use_own_court": False,
+                    "cart_id": cart_id,
+                }
+                for slot in slots
+            ]).returning(*(Reservation.__table__.c[field] for field in reservation_serializer.fields))
+        )
+        reservations = sorted(result.all(), key=lambda row: row.slot_id)
+        await db.commit()
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
-        db.rollback()
-        # Restore slot status if it was changed
-        if not request.use_own_court and request.slot_id and slot:
-            slot.status = SlotStatus.OPEN
-            db.commit()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error creating reservation: {str(e)}"
+            detail=f"Error creating cart reservation: {str(e)}"
         )
+    
+    await mark_slots([(slot.court_id, slot.start_ts) for slot in slots], available=False)
+    await start_hold(expires_at, *(reservation.id for reservation in reservations))
+    
+    fields = reservation_serializer.fields
+    return Response(
+        content=orjson.dumps({
+            "cart_id": cart_id,
+            "total_cents": sum(slot.price_cents for slot in slots),
+            "currency": currencies.pop(),
+            "expires_at": reservations[0].expires_at,
+            "reservations": [dict(zip(fields, row)) for row in reservations],
+        }, default=json_default),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
+    )
 
 @router.get("/reservations/my", response_model=List[ReservationResponse])
 async def my_reservations(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's reservations"""
-    reservations = db.query(Reservation).filter(
-        Reservation.booked_by_user_id == current_user.id
-    ).order_by(Reservation.created_at.desc()).all()
-    
-    return reservations
+    result = await db.execute(
+        reservation_keyset.apply(
+            reservation_serializer.select().where(Reservation.booked_by_user_id == current_user.id),
+            page
+        )
+    )
+    rows, headers = reservation_keyset.page(result, page)
+    return reservation_serializer.response(rows, headers=headers)
 
@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 from uuid import UUID
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.api.v1.auth import get_current_user
-from app.models.user import User, UserRole
+from app.core.user_cache import Principal
+from app.core.availability import mark_slots
+from app.core.holds import start_hold
+from app.core.serialization import StrId
+from app.models.user import UserRole
 from app.models.event import Event, EventType, EventStatus, MatchFormat
 from app.models.booking import Reservation, RecurrencePattern
 from app.models.match import Match
@@ -54,8 +59,8 @@ class OrganizeEventRequest(BaseModel):
     submit_for_approval: bool = False  # If True, submit immediately
 
 class EventResponse(BaseModel):
-    id: str
-    organizer_user_id: str
+    id: StrId
+    organizer_user_id: StrId
     sport: str
     match_format: str
     players_per_team: int
@@ -67,10 +72,10 @@ class EventResponse(BaseModel):
     recurrence_pattern: Optional[str]
     recurrence_end_date: Optional[datetime]
     use_own_court: bool
-    slot_id: Optional[str]
+    slot_id: Optional[StrId]
     custom_venue_json: Optional[Dict[str, Any]]
     players_json: Optional[List[Dict[str, Any]]]
-    formation_id: Optional[str]
+    formation_id: Optional[StrId]
     selected_addons_json: Optional[List[str]]
     status: str
     total_cost_cents: Optional[int]
@@ -95,19 +100,22 @@ def calculate_players_from_format(match_format: MatchFormat) -> Tuple[int, int]:
     }
     return format_map.get(match_format, (8, 16))
 
-def calculate_total_cost(
+async def calculate_total_cost(
     slot_price_cents: Optional[int],
     addon_ids: Optional[List[str]],
-    db: Session
+    db: AsyncSession
 ) -> int:
     """Calculate total cost (slot + add-ons)"""
     total = slot_price_cents or 0
     
     if addon_ids:
-        addons = db.query(Addon).filter(
-            Addon.id.in_([UUID(aid) for aid in addon_ids]),
-            Addon.status == AddonStatus.ACTIVE
-        ).all()
+        result = await db.execute(
+            select(Addon).where(
+                Addon.id.in_([UUID(aid) for aid in addon_ids]),
+                Addon.status == AddonStatus.ACTIVE
+            )
+        )
+        addons = result.scalars().all()
         total += sum(addon.price_cents for addon in addons)
     
     return total
@@ -115,8 +123,8 @@ def calculate_total_cost(
 @router.post("/organize", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
 async def organize_event(
     request: OrganizeEventRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new event (8-step workflow)"""
     
@@ -148,7 +156,8 @@ async def organize_event(
     
     if not request.use_own_court and request.slot_id:
         # Verify slot exists and is available
-        slot = db.query(Slot).filter(Slot.id == request.slot_id).first()
+        result = await db.execute(select(Slot).where(Slot.id == request.slot_id))
+        slot = result.scalar_one_or_none()
         if not slot:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -178,7 +187,8 @@ async def organize_event(
     
     # Validate formation if provided
     if request.formation_id:
-        formation = db.query(Formation).filter(Formation.id == request.formation_id).first()
+        result = await db.execute(select(Formation).where(Formation.id == request.formation_id))
+        formation = result.scalar_one_or_none()
         if not formation:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -188,10 +198,13 @@ async def organize_event(
     # Validate add-ons if provided
     if request.selected_addons_json:
         addon_ids = [UUID(aid) for aid in request.selected_addons_json]
-        addons = db.query(Addon).filter(
-            Addon.id.in_(addon_ids),
-            Addon.status == AddonStatus.ACTIVE
-        ).all()
+        result = await db.execute(
+            select(Addon).where(
+                Addon.id.in_(addon_ids),
+                Addon.status == AddonStatus.ACTIVE
+            )
+        )
+        addons = result.scalars().all()
         if len(addons) != len(addon_ids):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -199,7 +212,7 @@ async def organize_event(
             )
     
     # Calculate total cost
-    total_cost_cents = calculate_total_cost(
+    total_cost_cents = await calculate_total_cost(
         slot_price_cents,
         request.selected_addons_json,
         db
@@ -231,19 +244,20 @@ async def organize_event(
     )
     
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
     
     return event
 
 @router.get("/{event_id}", response_model=EventResponse)
 async def get_event(
     event_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get event details"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    event = result.scalar_one_or_none()
     
     if not event:
         raise HTTPException(
@@ -264,11 +278,12 @@ async def get_event(
 async def update_event(
     event_id: UUID,
     request: Dict[str, Any],
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update event (only if draft)"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    event = result.scalar_one_or_none()
     
     if not event:
         raise HTTPException(
@@ -305,29 +320,31 @@ async def update_event(
     if "slot_id" in request or "selected_addons_json" in request:
         slot_price_cents = None
         if event.slot_id:
-            slot = db.query(Slot).filter(Slot.id == event.slot_id).first()
+            result = await db.execute(select(Slot).where(Slot.id == event.slot_id))
+            slot = result.scalar_one_or_none()
             if slot:
                 slot_price_cents = slot.price_cents
         
-        event.total_cost_cents = calculate_total_cost(
+        event.total_cost_cents = await calculate_total_cost(
             slot_price_cents,
             event.selected_addons_json,
             db
         )
     
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
     
     return event
 
 @router.post("/{event_id}/submit", response_model=EventResponse)
 async def submit_event_for_approval(
     event_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit event for approval"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    event = result.scalar_one_or_none()
     
     if not event:
         raise HTTPException(
@@ -350,16 +367,16 @@ async def submit_event_for_approval(
     event.status = EventStatus.PENDING_APPROVAL
     event.submitted_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
     
     return event
 
 @router.post("/{event_id}/approve", response_model=EventResponse)
 async def approve_event(
     event_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Approve event (admin only)"""
     if current_user.role != UserRole.SUPER_ADMIN:
@@ -368,7 +385,8 @@ async def approve_event(
             detail="Only admins can approve events"
         )
     
-    event = db.query(Event).filter(Event.id == event_id).first()
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    event = result.scalar_one_or_none()
     
     if not event:
         raise HTTPException(
@@ -391,6 +409,9 @@ async def approve_event(
     from datetime import timedelta
     from app.core.config import settings
     
+    held_slot = None
+    new_hold = None
+    
     # Check if reservation already exists
     if not event.reservation_id:
         # Create reservation based on event
@@ -411,7 +432,10 @@ async def approve_event(
         
         # If using slot, verify it's still available and lock it
         if event.slot_id:
-            slot = db.query(Slot).with_for_update().filter(Slot.id == event.slot_id).first()
+            result = await db.execute(
+                select(Slot).where(Slot.id == event.slot_id).with_for_update()
+            )
+            slot = result.scalar_one_or_none()
             if not slot:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -419,10 +443,13 @@ async def approve_event(
                 )
             
             # Check for existing paid reservation (double booking prevention)
-            existing_paid = db.query(Reservation).filter(
-                Reservation.slot_id == event.slot_id,
-                Reservation.status == ReservationStatus.PAID
-            ).first()
+            result = await db.execute(
+                select(Reservation.id).where(
+                    Reservation.slot_id == event.slot_id,
+                    Reservation.status == ReservationStatus.PAID
+                ).limit(1)
+            )
+            existing_paid = result.scalar_one_or_none()
             
             if existing_paid:
                 raise HTTPException(
@@ -432,6 +459,7 @@ async def approve_event(
             
             if slot.status == SlotStatus.OPEN:
                 slot.status = SlotStatus.HELD
+                held_slot = (slot.court_id, slot.start_ts)
             elif slot.status != SlotStatus.HELD:
                 raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
@@ -439,13 +467,18 @@ async def approve_event(
                 )
         
         db.add(reservation)
-        db.flush()  # Get reservation ID
+        await db.flush()  # Get reservation ID
         
         # Link event to reservation
         event.reservation_id = reservation.id
+        new_hold = (expires_at, reservation.id)
     
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
+    if held_slot is not None:
+        await mark_slots([held_slot], available=False)
+    if new_hold is not None:
+        await start_hold(*new_hold)
     
     return event
 
@@ -456,8 +489,8 @@ class RejectEventRequest(BaseModel):
 async def reject_event(
     event_id: UUID,
     request: RejectEventRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reject event (admin only)"""
     if current_user.role != UserRole.SUPER_ADMIN:
@@ -466,7 +499,8 @@ async def reject_event(
             detail="Only admins can reject events"
         )
     
-    event = db.query(Event).filter(Event.id == event_id).first()
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    event = result.scalar_one_or_none()
     
     if not event:
         raise HTTPException(
@@ -483,8 +517,8 @@ async def reject_event(
     event.status = EventStatus.REJECTED
     event.rejection_reason = request.rejection_reason
     
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
     
     return event
 
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
-from app.core.database import get_db
+from app.core.database import get_async_db, get_async_read_db
 from app.api.v1.auth import get_current_user
-from app.models.user import User
+from app.core.user_cache import Principal
+from app.core.etag import conditional_get, seed_versions
+from app.core.serialization import StrId
 from app.models.formation import Squad, SquadMember, Formation, PlayerProfile
 from app.models.match import Match
 import secrets
@@ -24,9 +27,9 @@ class FormationCreateRequest(BaseModel):
     positions_json: Dict[str, Any]
 
 class FormationResponse(BaseModel):
-    id: str
-    match_id: Optional[str] = None
-    squad_id: Optional[str] = None
+    id: StrId
+    match_id: Optional[StrId] = None
+    squad_id: Optional[StrId] = None
     shape: str
     positions_json: Dict[str, Any]
     share_token: str
@@ -37,8 +40,8 @@ class FormationResponse(BaseModel):
 @router.post("/squads", status_code=status.HTTP_201_CREATED)
 async def create_squad(
     request: SquadCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a squad"""
     squad = Squad(
@@ -48,16 +51,16 @@ async def create_squad(
     )
     
     db.add(squad)
-    db.commit()
-    db.refresh(squad)
+    await db.commit()
+    await db.refresh(squad)
     
     return {"squad_id": str(squad.id), "team_name": squad.team_name}
 
 @router.post("/squads/import/whatsapp")
 async def import_squad_from_whatsapp(
     whatsapp_text: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Import squad from WhatsApp message (AI parsing)"""
     # TODO: Implement AI parsing of WhatsApp message
@@ -68,11 +71,12 @@ async def import_squad_from_whatsapp(
 async def create_match_formation(
     match_id: UUID,
     request: FormationCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create formation for a match"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    result = await db.execute(select(Match).where(Match.id == match_id))
+    match = result.scalar_one_or_none()
     if not match:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,20 +95,25 @@ async def create_match_formation(
     )
     
     db.add(formation)
-    db.commit()
-    db.refresh(formation)
+    await db.commit()
+    await db.refresh(formation)
     
     return formation
 
 @router.get("/formations/{share_token}", response_model=FormationResponse)
 async def get_formation_by_token(
     share_token: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get formation by share token (public access)"""
-    formation = db.query(Formation).filter(
-        Formation.share_token == share_token
-    ).first()
+    # Shared links always revalidate so edits show up immediately
+    response.headers.update(await conditional_get(request, f"formation:{share_token}", max_age=0))
+    result = await db.execute(
+        select(Formation).where(Formation.share_token == share_token)
+    )
+    formation = result.scalar_one_or_none()
     
     if not formation:
         raise HTTPException(
@@ -112,5 +121,7 @@ async def get_formation_by_token(
             detail="Formation not found"
         )
     
+    if "ETag" not in response.headers:
+        await seed_versions(f"formation:{share_token}")
     return formation
 
@@ -1,22 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from pydantic import AliasChoices, BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
-from app.core.database import get_db
+from app.core.database import get_async_db, get_async_read_db
 from app.api.v1.auth import get_current_user
+from app.core.user_cache import Principal
+from app.core.serialization import RowSerializer, StrId
+from app.core.pagination import Keyset, PageParams
+from app.core.compression import PrecompressedCache
+from app.core.config import settings
 from app.models.user import User, UserRole
 from app.models.match import Match, MatchStatus, RefereeAssignment, RefereeAssignmentStatus, MatchEvent
-from app.models.booking import Reservation
+from app.models.booking import Reservation, ReservationStatus
+from app.models.event import Event
 from app.models.venue import Slot
 
 router = APIRouter()
 
 class MatchResponse(BaseModel):
-    id: str
-    reservation_id: str
+    id: StrId
+    reservation_id: StrId
     sport: str
     status: str
     created_at: datetime
@@ -34,27 +42,40 @@ class MatchEventCreateRequest(BaseModel):
     payload: Dict[str, Any]
 
 class MatchEventResponse(BaseModel):
-    id: str
-    match_id: str
+    id: StrId
+    match_id: StrId
     seq: int
     ts: datetime
     type: str
-    payload: Dict[str, Any]
+    payload: Dict[str, Any] = Field(validation_alias=AliasChoices("payload", "payload_json"))  # column is payload_json
     created_at: datetime
     
     class Config:
         from_attributes = True
 
+# Fast JSON path for event logs - same shape as MatchEventResponse
+match_event_serializer = RowSerializer(
+    MatchEvent.id, MatchEvent.match_id, MatchEvent.seq, MatchEvent.ts, MatchEvent.type,
+    MatchEvent.payload_json.label("payload"), MatchEvent.created_at
+)
+match_event_keyset = Keyset(MatchEvent.seq, MatchEvent.id)
+
+# Event logs of finalized matches never change - serve them pre-compressed
+final_event_logs = PrecompressedCache(settings.PRECOMPRESSED_CACHE_MAX_ENTRIES)
+
 @router.post("/from-reservation/{reservation_id}", response_model=MatchResponse, status_code=status.HTTP_201_CREATED)
 async def create_match_from_reservation(
     reservation_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a match from a paid reservation"""
-    reservation = db.query(Reservation).options(
-        joinedload(Reservation.slot).joinedload(Slot.court)
-    ).filter(Reservation.id == reservation_id).first()
+    result = await db.execute(
+        select(Reservation).options(
+            joinedload(Reservation.slot).joinedload(Slot.court)
+        ).where(Reservation.id == reservation_id)
+    )
+    reservation = result.scalar_one_or_none()
     
     if not reservation:
         raise HTTPException(
@@ -69,7 +90,8 @@ async def create_match_from_reservation(
         )
     
     # Check if match already exists
-    existing_match = db.query(Match).filter(Match.reservation_id == reservation_id).first()
+    result = await db.execute(select(Match).where(Match.reservation_id == reservation_id))
+    existing_match = result.scalar_one_or_none()
     if existing_match:
         return existing_match
     
@@ -79,8 +101,10 @@ async def create_match_from_reservation(
         sport = reservation.slot.court.sport
     else:
         # Own court - get sport from event
-        from app.models.event import Event
-        event = db.query(Event).filter(Event.reservation_id == reservation_id).first()
+        result = await db.execute(
+            select(Event).where(Event.reservation_id == reservation_id).limit(1)
+        )
+        event = result.scalar_one_or_none()
         if event:
             sport = event.sport
     
@@ -97,8 +121,8 @@ async def create_match_from_reservation(
     )
     
     db.add(match)
-    db.commit()
-    db.refresh(match)
+    await db.commit()
+    await db.refresh(match)
     
     return match
 
@@ -106,8 +130,8 @@ async def create_match_from_reservation(
 async def offer_referee(
     match_id: UUID,
     request: RefereeOfferRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Offer referee assignment to a match"""
     # Only organizers or admins can offer referee assignments
@@ -117,7 +141,8 @@ async def offer_referee(
             detail="Only organizers or admins can offer referee assignments"
         )
     
-    match = db.query(Match).filter(Match.id == match_id).first()
+    result = await db.execute(select(Match).where(Match.id == match_id))
+    match = result.scalar_one_or_none()
     if not match:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -125,10 +150,13 @@ async def offer_referee(
         )
     
     # Check if referee user exists and has referee role
-    referee = db.query(User).filter(
-        User.id == request.referee_user_id,
-        User.role == UserRole.REFEREE
-    ).first()
+    result = await db.execute(
+        select(User).where(
+            User.id == request.referee_user_id,
+            User.role == UserRole.REFEREE
+        )
+    )
+    referee = result.scalar_one_or_none()
     
     if not referee:
         raise HTTPException(
@@ -137,10 +165,13 @@ async def offer_referee(
         )
     
     # Create or update assignment
-    assignment = db.query(RefereeAssignment).filter(
-        RefereeAssignment.match_id == match_id,
-        RefereeAssignment.referee_user_id == request.referee_user_id
-    ).first()
+    result = await db.execute(
+        select(RefereeAssignment).where(
+            RefereeAssignment.match_id == match_id,
+            RefereeAssignment.referee_user_id == request.referee_user_id
+        )
+    )
+    assignment = result.scalar_one_or_none()
     
     if assignment:
         assignment.status = RefereeAssignmentStatus.OFFERED
@@ -152,16 +183,16 @@ async def offer_referee(
         )
         db.add(assignment)
     
-    db.commit()
-    db.refresh(assignment)
+    await db.commit()
+    await db.refresh(assignment)
     
     return {"assignment_id": str(assignment.id), "status": assignment.status.value}
 
 @router.post("/{match_id}/referee/accept")
 async def accept_referee_assignment(
     match_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Referee accepts assignment"""
     if current_user.role != UserRole.REFEREE:
@@ -170,10 +201,13 @@ async def accept_referee_assignment(
             detail="Only referees can accept assignments"
         )
     
-    assignment = db.query(RefereeAssignment).filter(
-        RefereeAssignment.match_id == match_id,
-        RefereeAssignment.referee_user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(RefereeAssignment).where(
+            RefereeAssignment.match_id == match_id,
+            RefereeAssignment.referee_user_id == current_user.id
+        )
+    )
+    assignment = result.scalar_one_or_none()
     
     if not assignment:
         raise HTTPException(
@@ -184,18 +218,19 @@ async def accept_referee_assignment(
     assignment.status = RefereeAssignmentStatus.ACCEPTED
     assignment.responded_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     return {"status": "accepted", "assignment_id": str(assignment.id)}
 
 @router.post("/{match_id}/start")
 async def start_match(
     match_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Start a match - only referee can do this"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    result = await db.execute(select(Match).where(Match.id == match_id))
+    match = result.scalar_one_or_none()
     if not match:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -203,11 +238,14 @@ async def start_match(
         )
     
     # Check if user is assigned referee
-    assignment = db.query(RefereeAssignment).filter(
-        RefereeAssignment.match_id == match_id,
-        RefereeAssignment.referee_user_id == current_user.id,
-        RefereeAssignment.status == RefereeAssignmentStatus.ACCEPTED
-    ).first()
+    result = await db.execute(
+        select(RefereeAssignment).where(
+            RefereeAssignment.match_id == match_id,
+            RefereeAssignment.referee_user_id == current_user.id,
+            RefereeAssignment.status == RefereeAssignmentStatus.ACCEPTED
+        )
+    )
+    assignment = result.scalar_one_or_none()
     
     if not assignment and current_user.role != UserRole.SUPER_ADMIN:
         raise HTTPException(
@@ -219,9 +257,10 @@ async def start_match(
     match.started_at = datetime.utcnow()
     
     # Create KICKOFF event
-    last_seq = db.query(func.max(MatchEvent.seq)).filter(
-        MatchEvent.match_id == match_id
-    ).scalar() or 0
+    result = await db.execute(
+        select(func.max(MatchEvent.seq)).where(MatchEvent.match_id == match_id)
+    )
+    last_seq = result.scalar() or 0
     
     kickoff_event = MatchEvent(
         match_id=match_id,
@@ -233,7 +272,7 @@ async def start_match(
     )
     
     db.add(kickoff_event)
-    db.commit()
+    await db.commit()
     
     return {"status": "started", "match_id": str(match.id)}
 
@@ -241,11 +280,12 @@ async def start_match(
 async def create_match_event(
     match_id: UUID,
     request: MatchEventCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a match event (append-only with seq enforcement)"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    result = await db.execute(select(Match).where(Match.id == match_id))
+    match = result.scalar_one_or_none()
     if not match:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -259,11 +299,14 @@ async def create_match_event(
         )
     
     # Check if user is assigned referee
-    assignment = db.query(RefereeAssignment).filter(
-        RefereeAssignment.match_id == match_id,
-        RefereeAssignment.referee_user_id == current_user.id,
-        RefereeAssignment.status == RefereeAssignmentStatus.ACCEPTED
-    ).first()
+    result = await db.execute(
+        select(RefereeAssignment).where(
+            RefereeAssignment.match_id == match_id,
+            RefereeAssignment.referee_user_id == current_user.id,
+            RefereeAssignment.status == RefereeAssignmentStatus.ACCEPTED
+        )
+    )
+    assignment = result.scalar_one_or_none()
     
     if not assignment and current_user.role != UserRole.SUPER_ADMIN:
         raise HTTPException(
@@ -272,9 +315,10 @@ async def create_match_event(
         )
     
     # Get last sequence number
-    last_seq = db.query(func.max(MatchEvent.seq)).filter(
-        MatchEvent.match_id == match_id
-    ).scalar() or 0
+    result = await db.execute(
+        select(func.max(MatchEvent.seq)).where(MatchEvent.match_id == match_id)
+    )
+    last_seq = result.scalar() or 0
     
     # Enforce strict ordering
     if request.seq != last_seq + 1:
@@ -284,10 +328,13 @@ async def create_match_event(
         )
     
     # Check uniqueness
-    existing = db.query(MatchEvent).filter(
-        MatchEvent.match_id == match_id,
-        MatchEvent.seq == request.seq
-    ).first()
+    result = await db.execute(
+        select(MatchEvent.id).where(
+            MatchEvent.match_id == match_id,
+            MatchEvent.seq == request.seq
+        )
+    )
+    existing = result.scalar_one_or_none()
     
     if existing:
         raise HTTPException(
@@ -305,19 +352,20 @@ async def create_match_event(
     )
     
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
     
     return event
 
 @router.post("/{match_id}/finalize")
 async def finalize_match(
     match_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Finalize a match - triggers report generation"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    result = await db.execute(select(Match).where(Match.id == match_id))
+    match = result.scalar_one_or_none()
     if not match:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -331,11 +379,14 @@ async def finalize_match(
         )
     
     # Check if user is assigned referee
-    assignment = db.query(RefereeAssignment).filter(
-        RefereeAssignment.match_id == match_id,
-        RefereeAssignment.referee_user_id == current_user.id,
-        RefereeAssignment.status == RefereeAssignmentStatus.ACCEPTED
-    ).first()
+    result = await db.execute(
+        select(RefereeAssignment).where(
+            RefereeAssignment.match_id == match_id,
+            RefereeAssignment.referee_user_id == current_user.id,
+            RefereeAssignment.status == RefereeAssignmentStatus.ACCEPTED
+        )
+    )
+    assignment = result.scalar_one_or_none()
     
     if not assignment and current_user.role != UserRole.SUPER_ADMIN:
         raise HTTPException(
@@ -347,9 +398,10 @@ async def finalize_match(
     match.finalized_at = datetime.utcnow()
     
     # Create FINAL_WHISTLE event
-    last_seq = db.query(func.max(MatchEvent.seq)).filter(
-        MatchEvent.match_id == match_id
-    ).scalar() or 0
+    result = await db.execute(
+        select(func.max(MatchEvent.seq)).where(MatchEvent.match_id == match_id)
+    )
+    last_seq = result.scalar() or 0
     
     final_event = MatchEvent(
         match_id=match_id,
@@ -361,24 +413,45 @@ async def finalize_match(
     )
     
     db.add(final_event)
+    await db.commit()
     
-    # Enqueue report generation job
-    from app.tasks.reports import generate_match_report_task
-    generate_match_report_task.delay(str(match.id))
-    
-    db.commit()
+    # Enqueue report generation once the FINAL state is visible to the worker
+    # (by name - the task module is worker-only; publishing blocks, so off the loop)
+    from app.celery_app import celery_app
+    await run_in_threadpool(
+        celery_app.send_task, "app.tasks.reports.generate_match_report_task", args=[str(match.id)]
+    )
     
     return {"status": "finalized", "match_id": str(match.id)}
 
 @router.get("/{match_id}/events", response_model=List[MatchEventResponse])
 async def get_match_events(
     match_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all events for a match"""
-    events = db.query(MatchEvent).filter(
-        MatchEvent.match_id == match_id
-    ).order_by(MatchEvent.seq).all()
+    accept_encoding = request.headers.get("accept-encoding")
+    cache_key = f"{match_id}?{request.url.query}"
+    cached = final_event_logs.get(cache_key)
+    if cached is not None:
+        return await final_event_logs.response(cached, accept_encoding)
+    
+    # The match status rides along as a trailing column; the serializer only encodes its own fields
+    match_status = select(Match.status).where(Match.id == match_id).scalar_subquery().label("match_status")
+    result = await db.execute(
+        match_event_keyset.apply(
+            match_event_serializer.select().add_columns(match_status).where(MatchEvent.match_id == match_id),
+            page
+        )
+    )
+    rows, headers = match_event_keyset.page(result, page)
+    
+    # Events are only appended while LIVE, so a FINAL match's log is immutable
+    if rows and rows[0].match_status == MatchStatus.FINAL:
+        entry = final_event_logs.put(cache_key, match_event_serializer.dumps(rows), headers)
+        return await final_event_logs.response(entry, accept_encoding)
     
-    return events
+    return match_event_serializer.response(rows, headers=headers)
 
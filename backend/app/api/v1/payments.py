@@ -1,13 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Header, Request
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from pydantic import BaseModel
 from typing import Optional
 from uuid import UUID
+from datetime import datetime, timezone
+import logging
 import time
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.config import settings
 from app.api.v1.auth import get_current_user
-from app.models.user import User
+from app.core.user_cache import Principal
+from app.core.availability import mark_slots
+from app.core.holds import end_hold
 from app.models.booking import Reservation, ReservationStatus
 from app.models.payment import Payment, PaymentStatus, PaymentEvent
 from app.models.venue import Slot, SlotStatus
@@ -16,6 +23,15 @@ from app.models.event import Event
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+def _constraint_name(error: IntegrityError) -> Optional[str]:
+    """Name of the violated constraint or unique index (psycopg2 or asyncpg)"""
+    diag = getattr(error.orig, "diag", None)
+    if diag is not None:
+        return diag.constraint_name
+    return getattr(error.orig.__cause__, "constraint_name", None)
+
 class PaymentInitiateRequest(BaseModel):
     reservation_id: UUID
 
@@ -37,16 +53,19 @@ class PaymentWebhookPayload(BaseModel):
 async def initiate_payment(
     request: PaymentInitiateRequest,
     idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Initiate payment for a reservation"""
-    reservation = db.query(Reservation).options(
-        joinedload(Reservation.slot)
-    ).filter(
-        Reservation.id == request.reservation_id,
-        Reservation.booked_by_user_id == current_user.id
-    ).first()
+    """Initiate payment for a reservation (or for the whole cart it belongs to)"""
+    result = await db.execute(
+        select(Reservation).options(
+            joinedload(Reservation.slot)
+        ).where(
+            Reservation.id == request.reservation_id,
+            Reservation.booked_by_user_id == current_user.id
+        )
+    )
+    reservation = result.scalar_one_or_none()
     
     if not reservation:
         raise HTTPException(
@@ -60,11 +79,37 @@ async def initiate_payment(
             detail="Reservation is not in pending status"
         )
     
+    # The hold may have lapsed before its release task has run
+    if reservation.expires_at and reservation.expires_at <= datetime.now(timezone.utc):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Reservation hold has expired"
+        )
+    
+    # A cart is paid as a whole - one payment, attached to its first reservation
+    cart = [reservation]
+    if reservation.cart_id is not None:
+        result = await db.execute(
+            select(Reservation).options(
+                joinedload(Reservation.slot)
+            ).where(
+                Reservation.cart_id == reservation.cart_id
+            ).order_by(Reservation.slot_id)
+        )
+        cart = result.scalars().all()
+        if any(member.status != ReservationStatus.PENDING for member in cart):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cart is not in pending status"
+            )
+        reservation = cart[0]
+    
     # Check if payment already exists (idempotency)
     if idempotency_key:
-        existing_payment = db.query(Payment).filter(
-            Payment.reservation_id == request.reservation_id
-        ).first()
+        result = await db.execute(
+            select(Payment).where(Payment.reservation_id == reservation.id).limit(1)
+        )
+        existing_payment = result.scalar_one_or_none()
         if existing_payment:
             return PaymentInitiateResponse(
                 payment_id=str(existing_payment.id),
@@ -74,13 +119,15 @@ async def initiate_payment(
     
     # Determine payment amount (handle own court case)
     if reservation.slot:
-        amount_cents = reservation.slot.price_cents
+        amount_cents = sum(member.slot.price_cents for member in cart)
         currency = reservation.slot.currency
     else:
         # Own court - use a default amount or get from event
         # For now, use 0 or get from event if linked
-        from app.models.event import Event
-        event = db.query(Event).filter(Event.reservation_id == reservation.id).first()
+        result = await db.execute(
+            select(Event).where(Event.reservation_id == reservation.id).limit(1)
+        )
+        event = result.scalar_one_or_none()
         if event and event.total_cost_cents:
             amount_cents = event.total_cost_cents
             currency = event.currency
@@ -98,8 +145,8 @@ async def initiate_payment(
     )
     
     db.add(payment)
-    db.commit()
-    db.refresh(payment)
+    await db.commit()
+    await db.refresh(payment)
     
     # TODO: Integrate with actual payment provider
     payment_url = f"/payments/{payment.id}/checkout"
@@ -110,11 +157,20 @@ async def initiate_payment(
         status=payment.status.value
     )
 
+async def _already_processed(db: AsyncSession, provider: str, provider_event_id: str) -> dict:
+    result = await db.execute(
+        select(PaymentEvent.id).where(
+            PaymentEvent.provider == provider,
+            PaymentEvent.provider_event_id == provider_event_id
+        )
+    )
+    return {"status": "already_processed", "event_id": str(result.scalar_one())}
+
 @router.post("/webhook")
 async def payment_webhook(
     request: Request,
     provider: str = Header(..., alias="X-Payment-Provider"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Handle payment webhook with idempotency and signature verification"""
     import json
@@ -130,14 +186,23 @@ async def payment_webhook(
         )
     
     # Check idempotency - if event already processed, return 200
-    existing_event = db.query(PaymentEvent).filter(
-        PaymentEvent.provider == provider,
-        PaymentEvent.provider_event_id == provider_event_id
-    ).first()
+    result = await db.execute(
+        select(PaymentEvent).where(
+            PaymentEvent.provider == provider,
+            PaymentEvent.provider_event_id == provider_event_id
+        )
+    )
+    existing_event = result.scalar_one_or_none()
     
     if existing_event:
         return {"status": "already_processed", "event_id": str(existing_event.id)}
     
+    # Slots whose availability changes - reflected in the index after the commit
+    closed_slots = []
+    reopened_slots = []
+    settled_holds = []
+    payment_id = None
+    
     # Use transaction for atomicity
     try:
         # Store webhook event
@@ -196,69 +261,123 @@ async def payment_webhook(
         # Update payment and reservation status
         payment_ref = payload.get("payment_id") or payload.get("data", {}).get("object", {}).get("id")
         if payment_ref:
-            payment = db.query(Payment).options(
-                joinedload(Payment.reservation).joinedload(Reservation.slot).joinedload(Slot.court)
-            ).filter(
-                Payment.provider_ref == payment_ref
-            ).first()
+            result = await db.execute(
+                select(Payment).options(
+                    joinedload(Payment.reservation).joinedload(Reservation.slot).joinedload(Slot.court)
+                ).where(
+                    Payment.provider_ref == payment_ref
+                )
+            )
+            payment = result.unique().scalar_one_or_none()
             
             if not payment:
                 # Payment not found - log warning but don't fail webhook
-                import logging
-                logger = logging.getLogger(__name__)
                 logger.warning(f"Payment webhook received for unknown payment_ref: {payment_ref}")
                 # Continue processing - webhook event is still stored for audit
             
             if payment:
+                payment_id = payment.id
                 # Determine payment status from webhook
                 webhook_status = payload.get("type") or payload.get("status", "").lower()
                 
+                # A cart payment settles every reservation in the cart
+                reservations = [payment.reservation]
+                if payment.reservation.cart_id is not None:
+                    result = await db.execute(
+                        select(Reservation).options(
+                            joinedload(Reservation.slot).joinedload(Slot.court)
+                        ).where(
+                            Reservation.cart_id == payment.reservation.cart_id
+                        ).order_by(Reservation.slot_id)
+                    )
+                    reservations = result.unique().scalars().all()
+                
                 if "succeeded" in webhook_status or "captured" in webhook_status:
                     payment.status = PaymentStatus.CAPTURED
                     payment.provider_ref = payment_ref
                     
-                    # Update reservation
-                    reservation = payment.reservation
-                    reservation.status = ReservationStatus.PAID
-                    reservation.payment_id = payment.id
-                    
-                    # Update slot (if exists - own court reservations don't have slots)
-                    if reservation.slot:
-                        reservation.slot.status = SlotStatus.BOOKED
-                    
-                    # Create match automatically
-                    # Get sport from slot or event
-                    sport = None
-                    if reservation.slot:
-                        sport = reservation.slot.court.sport
-                    else:
-                        # Own court - get sport from event
-                        from app.models.event import Event
-                        event = db.query(Event).filter(Event.reservation_id == reservation.id).first()
-                        if event:
-                            sport = event.sport
-                    
-                    if sport:
-                        match = Match(
-                            reservation_id=reservation.id,
-                            sport=sport,
-                            status=MatchStatus.SCHEDULED
-                        )
-                        db.add(match)
+                    for reservation in reservations:
+                        # Update reservation
+                        reservation.status = ReservationStatus.PAID
+                        reservation.payment_id = payment.id
+                        settled_holds.append(reservation.id)
+                        
+                        # Update slot (if exists - own court reservations don't have slots)
+                        if reservation.slot:
+                            reservation.slot.status = SlotStatus.BOOKED
+                            closed_slots.append((reservation.slot.court_id, reservation.slot.start_ts))
+                        
+                        # Create match automatically
+                        # Get sport from slot or event
+                        sport = None
+                        if reservation.slot:
+                            sport = reservation.slot.court.sport
+                        else:
+                            # Own court - get sport from event
+                            result = await db.execute(
+                                select(Event).where(Event.reservation_id == reservation.id).limit(1)
+                            )
+                            event = result.scalar_one_or_none()
+                            if event:
+                                sport = event.sport
+                        
+                        if sport:
+                            match = Match(
+                                reservation_id=reservation.id,
+                                sport=sport,
+                                status=MatchStatus.SCHEDULED
+                            )
+                            db.add(match)
                 
                 elif "failed" in webhook_status:
                     payment.status = PaymentStatus.FAILED
-                    reservation = payment.reservation
-                    reservation.status = ReservationStatus.CANCELLED
-                    # Update slot (if exists - own court reservations don't have slots)
-                    if reservation.slot:
-                        reservation.slot.status = SlotStatus.OPEN
+                    for reservation in reservations:
+                        reservation.status = ReservationStatus.CANCELLED
+                        settled_holds.append(reservation.id)
+                        # Update slot (if exists - own court reservations don't have slots)
+                        if reservation.slot:
+                            reservation.slot.status = SlotStatus.OPEN
+                            reopened_slots.append((reservation.slot.court_id, reservation.slot.start_ts))
         
-        db.commit()
+        await db.commit()
+        await mark_slots(closed_slots, available=False)
+        await mark_slots(reopened_slots, available=True)
+        await end_hold(*settled_holds)
         return {"status": "processed", "event_id": str(payment_event.id)}
     
+    except IntegrityError as e:
+        await db.rollback()
+        constraint = _constraint_name(e)
+        if constraint == "uq_payment_event_provider_id":
+            # A concurrent delivery of the same event got in first
+            return await _already_processed(db, provider, provider_event_id)
+        if constraint != "uq_reservation_paid_slot" or payment_id is None:
+            logger.error(f"Payment webhook {provider_event_id} failed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error processing webhook"
+            )
+        # Another reservation for the slot was paid first. The money was still taken: keep
+        # the event and flag the payment for a refund instead of bouncing the webhook
+        logger.error(f"Payment webhook {provider_event_id} would double-book a slot; payment {payment_id} needs a refund")
+        try:
+            payment_event = PaymentEvent(
+                payment_id=payment_id,
+                provider=provider,
+                provider_event_id=provider_event_id,
+                payload_json=payload
+            )
+            db.add(payment_event)
+            await db.execute(
+                update(Payment).where(Payment.id == payment_id).values(status=PaymentStatus.REFUND_PENDING)
+            )
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return await _already_processed(db, provider, provider_event_id)
+        return {"status": "refund_pending", "event_id": str(payment_event.id)}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing webhook: {str(e)}"
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.pagination import Keyset, PageParams
 from app.api.v1.auth import get_current_user
-from app.models.user import User, UserRole
+from app.core.user_cache import Principal
+from app.core.serialization import StrId
+from app.models.user import UserRole
 from app.models.pt import PTRequest, PTRequestScope, PTRequestStatus
 
 router = APIRouter()
 
+inbox_keyset = Keyset(PTRequest.created_at, PTRequest.id, descending=True)
+
 class PTRequestCreateRequest(BaseModel):
     scope: PTRequestScope
     pt_user_id: Optional[UUID] = None
@@ -19,10 +25,10 @@ class PTRequestCreateRequest(BaseModel):
     details: Dict[str, Any]
 
 class PTRequestResponse(BaseModel):
-    id: str
+    id: StrId
     scope: str
-    requester_user_id: str
-    pt_user_id: Optional[str] = None
+    requester_user_id: StrId
+    pt_user_id: Optional[StrId] = None
     status: str
     details: Dict[str, Any]
     created_at: datetime
@@ -33,8 +39,8 @@ class PTRequestResponse(BaseModel):
 @router.post("/requests", response_model=PTRequestResponse, status_code=status.HTTP_201_CREATED)
 async def create_pt_request(
     request: PTRequestCreateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a PT request"""
     pt_request = PTRequest(
@@ -48,15 +54,17 @@ async def create_pt_request(
     )
     
     db.add(pt_request)
-    db.commit()
-    db.refresh(pt_request)
+    await db.commit()
+    await db.refresh(pt_request)
     
     return pt_request
 
 @router.get("/inbox", response_model=List[PTRequestResponse])
 async def get_pt_inbox(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get PT inbox - requests for current user as PT"""
     if current_user.role != UserRole.PERSONAL_TRAINER:
@@ -66,22 +74,23 @@ async def get_pt_inbox(
         )
     
     # Get requests where PT is assigned to current user OR unassigned (pt_user_id is None)
-    from sqlalchemy import or_
-    requests = db.query(PTRequest).filter(
+    query = select(PTRequest).where(
         or_(
             PTRequest.pt_user_id == current_user.id,
             PTRequest.pt_user_id.is_(None)
         ),
         PTRequest.status == PTRequestStatus.OPEN
-    ).order_by(PTRequest.created_at.desc()).all()
-    
+    )
+    result = await db.execute(inbox_keyset.apply(query, page))
+    requests, headers = inbox_keyset.page(result.scalars(), page)
+    response.headers.update(headers)
     return requests
 
 @router.post("/requests/{request_id}/accept")
 async def accept_pt_request(
     request_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Accept a PT request"""
     if current_user.role != UserRole.PERSONAL_TRAINER:
@@ -90,14 +99,16 @@ async def accept_pt_request(
             detail="Only personal trainers can accept requests"
         )
     
-    from sqlalchemy import or_
-    pt_request = db.query(PTRequest).filter(
-        PTRequest.id == request_id,
-        or_(
-            PTRequest.pt_user_id == current_user.id,
-            PTRequest.pt_user_id.is_(None)  # Can accept unassigned requests
+    result = await db.execute(
+        select(PTRequest).where(
+            PTRequest.id == request_id,
+            or_(
+                PTRequest.pt_user_id == current_user.id,
+                PTRequest.pt_user_id.is_(None)  # Can accept unassigned requests
+            )
         )
-    ).first()
+    )
+    pt_request = result.scalar_one_or_none()
     
     if not pt_request:
         raise HTTPException(
@@ -110,7 +121,7 @@ async def accept_pt_request(
         pt_request.pt_user_id = current_user.id
     
     pt_request.status = PTRequestStatus.ACCEPTED
-    db.commit()
+    await db.commit()
     
     return {"status": "accepted", "request_id": str(request_id)}
 
@@ -1,20 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.serialization import StrId
 from app.models.match import Match, MatchReport, ReportStatus, MatchStatus
 from app.models.match import MatchEvent
-from sqlalchemy import func
 
 router = APIRouter()
 
 class ReportResponse(BaseModel):
-    id: str
-    match_id: str
+    id: StrId
+    match_id: StrId
     version: int
     status: str
     pdf_url: Optional[str] = None
@@ -27,10 +29,11 @@ class ReportResponse(BaseModel):
 @router.post("/matches/{match_id}/generate")
 async def generate_report(
     match_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Trigger report generation for a match"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    result = await db.execute(select(Match).where(Match.id == match_id))
+    match = result.scalar_one_or_none()
     if not match:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -44,9 +47,10 @@ async def generate_report(
         )
     
     # Get latest report version
-    latest_version = db.query(func.max(MatchReport.version)).filter(
-        MatchReport.match_id == match_id
-    ).scalar() or 0
+    result = await db.execute(
+        select(func.max(MatchReport.version)).where(MatchReport.match_id == match_id)
+    )
+    latest_version = result.scalar() or 0
     
     # Create new report version
     report = MatchReport(
@@ -56,25 +60,30 @@ async def generate_report(
     )
     
     db.add(report)
-    db.commit()
-    db.refresh(report)
+    await db.commit()
+    await db.refresh(report)
     
-    # Enqueue generation task
-    from app.tasks.reports import generate_match_report_task
-    generate_match_report_task.delay(str(match_id), report.version)
+    # Enqueue generation task (by name - the task module is worker-only; publishing blocks, so off the loop)
+    from app.celery_app import celery_app
+    await run_in_threadpool(
+        celery_app.send_task, "app.tasks.reports.generate_match_report_task", args=[str(match_id), report.version]
+    )
     
     return {"report_id": str(report.id), "version": report.version, "status": "generating"}
 
 @router.get("/matches/{match_id}/report")
 async def get_match_report(
     match_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get the latest report for a match"""
-    report = db.query(MatchReport).filter(
-        MatchReport.match_id == match_id,
-        MatchReport.status == ReportStatus.READY
-    ).order_by(MatchReport.version.desc()).first()
+    result = await db.execute(
+        select(MatchReport).where(
+            MatchReport.match_id == match_id,
+            MatchReport.status == ReportStatus.READY
+        ).order_by(MatchReport.version.desc()).limit(1)
+    )
+    report = result.scalar_one_or_none()
     
     if not report:
         raise HTTPException(
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, booking, payments, matchops, reports, awards, pt, formation, ads, admin, events, addons
+from app.api.v1 import auth, booking, payments, matchops, reports, awards, pt, formation, ads, admin, events, addons, schedules
 
 api_router = APIRouter()
 
@@ -11,6 +11,7 @@ api_router.include_router(matchops.router, prefix="/matches", tags=["Match Opera
 api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
 api_router.include_router(events.router, prefix="/events", tags=["Events"])
 api_router.include_router(addons.router, prefix="/addons", tags=["Add-ons"])
+api_router.include_router(schedules.router, prefix="/schedules", tags=["Schedules"])
 
 # Phase 2 - v1.2 enhancements
 api_router.include_router(awards.router, prefix="/awards", tags=["Awards"])
@@ -0,0 +1,259 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+from datetime import date, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.redis_client import get_async_redis
+from app.api.v1.auth import get_current_user
+from app.core.user_cache import Principal
+from app.core.serialization import StrId
+from app.models.user import UserRole
+from app.models.venue import Venue, Court, SlotTemplate
+
+router = APIRouter()
+
+# task id -> court id, so job status is only shown to whoever can manage the court
+JOB_COURT_KEY = "slot_generation_job:{}"
+JOB_COURT_TTL_SECONDS = 86400  # Celery keeps results for a day by default
+
+class TemplateBand(BaseModel):
+    weekday: int = Field(..., ge=0, le=6)  # 0 = Monday
+    start_time: time
+    end_time: time  # 00:00 = midnight
+    slot_minutes: int = Field(..., ge=5, le=24 * 60)
+    price_cents: int = Field(..., ge=0)
+    currency: str = Field("USD", min_length=3, max_length=3)
+
+class TemplateRequest(BaseModel):
+    timezone: str = "UTC"
+    bands: List[TemplateBand]
+
+class TemplateBandResponse(BaseModel):
+    id: StrId
+    weekday: int
+    start_time: time
+    end_time: time
+    slot_minutes: int
+    price_cents: int
+    currency: str
+
+    class Config:
+        from_attributes = True
+
+class TemplateResponse(BaseModel):
+    court_id: str
+    timezone: str
+    bands: List[TemplateBandResponse]
+
+class GenerateRequest(BaseModel):
+    from_date: date
+    to_date: date  # inclusive
+
+class GenerationJobResponse(BaseModel):
+    task_id: str
+    state: str
+    inserted: int = 0
+    skipped: int = 0
+    total: int = 0
+    error: Optional[str] = None
+
+def _minutes(value: time, is_end: bool = False) -> int:
+    minutes = value.hour * 60 + value.minute
+    return 24 * 60 if is_end and minutes == 0 else minutes
+
+async def _get_owned_court(court_id: UUID, current_user: Principal, db: AsyncSession) -> Court:
+    """Court lookup for schedule management - venue owner or admin only"""
+    result = await db.execute(
+        select(Court, Venue.owner_user_id).join(Venue, Venue.id == Court.venue_id).where(Court.id == court_id)
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Court not found"
+        )
+    court, owner_user_id = row
+    if owner_user_id != current_user.id and current_user.role != UserRole.SUPER_ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the venue owner can manage this court's schedule"
+        )
+    return court
+
+def _template_response(court_id: UUID, bands: List[SlotTemplate]) -> TemplateResponse:
+    return TemplateResponse(
+        court_id=str(court_id),
+        timezone=bands[0].timezone if bands else "UTC",
+        bands=[
+            TemplateBandResponse(
+                id=str(band.id),
+                weekday=band.weekday,
+                start_time=band.start_time,
+                end_time=band.end_time,
+                slot_minutes=band.slot_minutes,
+                price_cents=band.price_cents,
+                currency=band.currency
+            )
+            for band in bands
+        ]
+    )
+
+@router.put("/courts/{court_id}/template", response_model=TemplateResponse)
+async def put_court_template(
+    court_id: UUID,
+    request: TemplateRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Replace a court's weekly template (opening hours, slot length and price per band)"""
+    await _get_owned_court(court_id, current_user, db)
+
+    try:
+        ZoneInfo(request.timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown timezone"
+        )
+
+    # Bands must be well-formed and must not overlap within a weekday
+    by_day = {}
+    resolution = settings.AVAILABILITY_BITMAP_RESOLUTION_MINUTES
+    for band in request.bands:
+        start, end = _minutes(band.start_time), _minutes(band.end_time, is_end=True)
+        # Every slot start must land on its own availability-index unit
+        if start % resolution or band.slot_minutes % resolution:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Band start and slot length must be multiples of {resolution} minutes"
+            )
+        if start >= end or end - start < band.slot_minutes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Each band must span at least one slot"
+            )
+        by_day.setdefault(band.weekday, []).append((start, end))
+    for spans in by_day.values():
+        spans.sort()
+        if any(prev_end > start for (_, prev_end), (start, _) in zip(spans, spans[1:])):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Bands overlap on the same weekday"
+            )
+
+    await db.execute(delete(SlotTemplate).where(SlotTemplate.court_id == court_id))
+    bands = [
+        SlotTemplate(
+            court_id=court_id,
+            weekday=band.weekday,
+            start_time=band.start_time,
+            end_time=band.end_time,
+            slot_minutes=band.slot_minutes,
+            price_cents=band.price_cents,
+            currency=band.currency.upper(),
+            timezone=request.timezone
+        )
+        for band in request.bands
+    ]
+    db.add_all(bands)
+    await db.commit()
+
+    bands.sort(key=lambda band: (band.weekday, band.start_time))
+    return _template_response(court_id, bands)
+
+@router.get("/courts/{court_id}/template", response_model=TemplateResponse)
+async def get_court_template(
+    court_id: UUID,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """A court's weekly template"""
+    await _get_owned_court(court_id, current_user, db)
+
+    result = await db.execute(
+        select(SlotTemplate).where(
+            SlotTemplate.court_id == court_id
+        ).order_by(SlotTemplate.weekday, SlotTemplate.start_time)
+    )
+    return _template_response(court_id, result.scalars().all())
+
+@router.post("/courts/{court_id}/generate", response_model=GenerationJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def generate_court_slots(
+    court_id: UUID,
+    request: GenerateRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Expand the court's template into slots for [from_date, to_date] in the background"""
+    await _get_owned_court(court_id, current_user, db)
+
+    if request.to_date < request.from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="to_date must not be before from_date"
+        )
+    if (request.to_date - request.from_date) >= timedelta(days=settings.SLOT_GENERATION_MAX_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Generation window is limited to {settings.SLOT_GENERATION_MAX_DAYS} days"
+        )
+
+    result = await db.execute(select(SlotTemplate.id).where(SlotTemplate.court_id == court_id).limit(1))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Court has no weekly template"
+        )
+
+    # Enqueue by name - the task module is worker-only; publishing blocks, keep it off the loop
+    from app.celery_app import celery_app
+    task = await run_in_threadpool(
+        celery_app.send_task,
+        "app.tasks.slots.generate_slots_from_template",
+        args=[str(court_id), request.from_date.isoformat(), request.to_date.isoformat()]
+    )
+    await get_async_redis().set(JOB_COURT_KEY.format(task.id), str(court_id), ex=JOB_COURT_TTL_SECONDS)
+
+    return GenerationJobResponse(task_id=task.id, state="PENDING")
+
+@router.get("/jobs/{task_id}", response_model=GenerationJobResponse)
+async def get_generation_job(
+    task_id: str,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Progress of a slot generation job"""
+    court_id = await get_async_redis().get(JOB_COURT_KEY.format(task_id))
+    if court_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    await _get_owned_court(UUID(court_id), current_user, db)
+
+    from app.celery_app import celery_app
+
+    def read_state():
+        result = celery_app.AsyncResult(task_id)
+        return result.state, result.info
+
+    state, info = await run_in_threadpool(read_state)
+    if isinstance(info, dict):
+        return GenerationJobResponse(
+            task_id=task_id,
+            state=state,
+            inserted=info.get("inserted", 0),
+            skipped=info.get("skipped", 0),
+            total=info.get("total", 0)
+        )
+    return GenerationJobResponse(
+        task_id=task_id,
+        state=state,
+        error=str(info) if state == "FAILURE" else None
+    )
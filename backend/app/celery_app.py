@@ -6,7 +6,7 @@ celery_app = Celery(
     "mosab_sport",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["app.tasks.reports", "app.tasks.reservations"]
+    include=["app.tasks.reports", "app.tasks.reservations", "app.tasks.availability", "app.tasks.slots"]
 )
 
 celery_app.conf.update(
@@ -21,7 +21,11 @@ celery_app.conf.update(
     beat_schedule={
         "expire-pending-reservations": {
             "task": "app.tasks.reservations.expire_pending_reservations",
-            "schedule": crontab(minute="*"),  # Every minute
+            "schedule": crontab(minute="*/15"),  # Safety net - holds are released by release_hold at expiry
+        },
+        "reconcile-availability-index": {
+            "task": "app.tasks.availability.reconcile_availability_index",
+            "schedule": crontab(minute="*/10"),  # Every 10 minutes
         },
     },
 )
@@ -0,0 +1,173 @@
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+from app.core.redis_client import get_async_redis, redis_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One Redis bitmap per court per UTC day; bit N is set while an OPEN slot starts at
+# the N-th AVAILABILITY_BITMAP_RESOLUTION_MINUTES boundary of that day, so one bit is
+# exactly one slot. Schedule templates only produce aligned starts; a court-day holding
+# any other start (legacy or hand-made slots) is left out of the index. The reconciliation
+# task writes a bitmap for every court-day in the index window (all zeros when nothing
+# is open) and slot status changes update existing bitmaps in place. A missing key -
+# not built yet, or evicted (Redis runs allkeys-lru) - means unknown, never "no slots",
+# so readers fall back to SQL.
+RESOLUTION = timedelta(minutes=settings.AVAILABILITY_BITMAP_RESOLUTION_MINUTES)
+UNITS_PER_DAY = int(timedelta(days=1) / RESOLUTION)
+BYTES_PER_DAY = (UNITS_PER_DAY + 7) // 8
+
+# SETBIT only on bitmaps the rebuild wrote; recreating an evicted key would leave a
+# bitmap holding this one bit that readers take as complete
+SETBIT_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('SETBIT', KEYS[1], ARGV[1], ARGV[2])
+end
+return -1
+"""
+
+def _utc(ts: datetime) -> datetime:
+    """Slot timestamps are stored as UTC; naive values are taken as UTC"""
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, dt_time.min, tzinfo=timezone.utc)
+
+def bitmap_key(court_id, day: date) -> str:
+    return f"slot_avail:{court_id}:{day:%Y%m%d}"
+
+def _position(start_ts: datetime) -> Tuple[date, int]:
+    start_ts = _utc(start_ts)
+    day = start_ts.date()
+    return day, int((start_ts - _day_start(day)) / RESOLUTION)
+
+def _aligned(start_ts: datetime) -> bool:
+    """Whether a slot start sits exactly on a bitmap unit boundary"""
+    start_ts = _utc(start_ts)
+    return (start_ts - _day_start(start_ts.date())) % RESOLUTION == timedelta(0)
+
+def _expire_at(day: date) -> int:
+    """Keep a day's bitmap until a day after it ends"""
+    return int((_day_start(day) + timedelta(days=2)).timestamp())
+
+def _commands(slots: Iterable[Tuple]):
+    """(key, unit) per slot; unit is None when the start can't have a bit of its own"""
+    for court_id, start_ts in slots:
+        day, unit = _position(start_ts)
+        yield bitmap_key(court_id, day), unit if _aligned(start_ts) else None
+
+def _queue(pipe, commands, available: bool):
+    for key, unit in commands:
+        if unit is None:
+            # Drop the court-day from the index - readers fall back to SQL
+            pipe.delete(key)
+        else:
+            pipe.eval(SETBIT_IF_EXISTS, 1, key, unit, int(available))
+
+async def mark_slots(slots: Iterable[Tuple], available: bool):
+    """Record (court_id, start_ts) slots as OPEN (available=True) or taken - call after the commit"""
+    commands = list(_commands(slots))
+    if not commands:
+        return
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            _queue(pipe, commands, available)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Availability index update failed: {e}")
+
+def mark_slots_sync(slots: Iterable[Tuple], available: bool):
+    """mark_slots for Celery tasks and scripts"""
+    commands = list(_commands(slots))
+    if not commands:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        _queue(pipe, commands, available)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Availability index update failed: {e}")
+
+def _day_ranges(start: datetime, end: datetime):
+    """(day, first unit, last unit) for the slot starts in [start, end)"""
+    start, end = _utc(start), _utc(end) - timedelta(microseconds=1)
+    day = start.date()
+    while day <= end.date():
+        # Round the start up - a unit before it would count a slot starting earlier
+        first = _position(start)[1] + (not _aligned(start)) if day == start.date() else 0
+        last = _position(end)[1] if day == end.date() else UNITS_PER_DAY - 1
+        # first > last (no boundary in the window) still checks the key; BITCOUNT gives 0
+        yield day, first, last
+        day += timedelta(days=1)
+
+def _indexed_window(start: datetime, end: datetime) -> bool:
+    """Whether [start, end) lies in the days the reconciliation task keeps built"""
+    today = datetime.now(timezone.utc).date()
+    return _utc(start) >= _day_start(today) and _utc(end) <= _day_start(today + timedelta(days=settings.AVAILABILITY_INDEX_DAYS))
+
+async def open_slot_counts(court_ids: List, start: datetime, end: datetime) -> Optional[Dict]:
+    """Open slots starting in [start, end) per court, or None if the index does not cover them"""
+    if not _indexed_window(start, end):
+        return None
+    redis = get_async_redis()
+    ranges = list(_day_ranges(start, end))
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for court_id in court_ids:
+                for day, first, last in ranges:
+                    key = bitmap_key(court_id, day)
+                    pipe.exists(key)
+                    pipe.bitcount(key, first, last, mode="BIT")
+            results = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Availability index read failed: {e}")
+        return None
+    exists, counts = results[0::2], results[1::2]
+    if not all(exists):
+        return None
+    per_court = len(ranges)
+    return {
+        court_id: sum(counts[i * per_court:(i + 1) * per_court])
+        for i, court_id in enumerate(court_ids)
+    }
+
+def rebuild_index(db, days: int) -> Dict[str, int]:
+    """Rewrite the bitmaps for every court-day in today .. today+days from the slots table (sync session)"""
+    from app.models.venue import Court, Slot, SlotStatus
+
+    today = datetime.now(timezone.utc).date()
+    window_start, window_end = _day_start(today), _day_start(today + timedelta(days=days))
+
+    # Every court-day gets a bitmap, so a missing key always means "not indexed"
+    window_days = [today + timedelta(days=i) for i in range(days)]
+    bitmaps = {
+        (bitmap_key(court_id, day), day): bytearray(BYTES_PER_DAY)
+        for (court_id,) in db.query(Court.id).yield_per(5000)
+        for day in window_days
+    }
+    rows = db.query(Slot.court_id, Slot.start_ts).filter(
+        Slot.status == SlotStatus.OPEN,
+        Slot.start_ts >= window_start,
+        Slot.start_ts < window_end
+    ).yield_per(5000)
+    open_slots = 0
+    unindexed = set()
+    for court_id, start_ts in rows:
+        day, unit = _position(start_ts)
+        bitmap = bitmaps.setdefault((bitmap_key(court_id, day), day), bytearray(BYTES_PER_DAY))
+        bit = 0x80 >> (unit % 8)
+        if not _aligned(start_ts) or bitmap[unit // 8] & bit:
+            # Unaligned, or sharing a unit with another open slot - counts would be wrong
+            unindexed.add((bitmap_key(court_id, day), day))
+        bitmap[unit // 8] |= bit
+        open_slots += 1
+
+    pipe = redis_client.pipeline(transaction=False)
+    for (key, day), bitmap in bitmaps.items():
+        if (key, day) in unindexed:
+            pipe.delete(key)
+        else:
+            pipe.set(key, bytes(bitmap), exat=_expire_at(day))
+    pipe.execute()
+    return {"open_slots": open_slots, "bitmaps": len(bitmaps) - len(unindexed), "unindexed": len(unindexed)}
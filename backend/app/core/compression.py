@@ -0,0 +1,121 @@
+from fastapi import Response
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Optional
+from app.core.cache import LRUCache
+from app.core.config import settings
+import gzip
+
+# Optional codecs - gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Levels for per-request compression (cheap) and compress-once payloads (dense)
+DYNAMIC_LEVELS = {"zstd": 3, "br": 4, "gzip": 5}
+STATIC_LEVELS = {"zstd": 15, "br": 9, "gzip": 9}
+
+# Bodies above this size are compressed off the event loop
+THREADPOOL_MIN_SIZE = 256 * 1024
+
+def available_encodings() -> list:
+    """Supported content codings in server preference order"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+ENCODINGS = available_encodings()
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick a coding from Accept-Encoding (highest q, ties go to server preference)"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+async def compress_async(data: bytes, encoding: str, level: int) -> bytes:
+    if len(data) >= THREADPOOL_MIN_SIZE:
+        return await run_in_threadpool(compress, data, encoding, level)
+    return compress(data, encoding, level)
+
+def is_excluded(content_type: Optional[str]) -> bool:
+    """Already-compressed or streaming media types that must pass through untouched"""
+    if not content_type:
+        return True
+    content_type = content_type.lower()
+    return any(content_type.startswith(prefix) for prefix in settings.COMPRESSION_EXCLUDED_TYPES)
+
+class PrecompressedBody:
+    """An immutable response body with its encoded variants, filled in on first use"""
+
+    def __init__(self, body: bytes, headers: Dict[str, str]):
+        self.body = body
+        self.headers = headers
+        self.encoded: Dict[str, bytes] = {}
+
+class PrecompressedCache:
+    """Compress-once cache for immutable payloads (e.g. finalized match event logs).
+
+    Each coding is produced at a high level the first time a client asks for it
+    and then served as-is; CompressionMiddleware skips responses that already
+    carry Content-Encoding.
+    """
+
+    def __init__(self, max_entries: int):
+        self._cache = LRUCache(max_entries)
+
+    def get(self, key: str) -> Optional[PrecompressedBody]:
+        return self._cache.get(key)
+
+    def put(self, key: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> PrecompressedBody:
+        entry = PrecompressedBody(body, dict(headers or {}))
+        # Immutable - only LRU eviction removes it
+        self._cache.set(key, entry, expires_at=float("inf"))
+        return entry
+
+    async def response(self, entry: PrecompressedBody, accept_encoding: Optional[str]) -> Response:
+        headers = dict(entry.headers)
+        headers["Vary"] = "Accept-Encoding"
+        encoding = negotiate(accept_encoding) if len(entry.body) >= settings.COMPRESSION_MIN_SIZE else None
+        if encoding is None:
+            return Response(content=entry.body, headers=headers, media_type="application/json")
+        content = entry.encoded.get(encoding)
+        if content is None:
+            content = await compress_async(entry.body, encoding, STATIC_LEVELS[encoding])
+            entry.encoded[encoding] = content
+        headers["Content-Encoding"] = encoding
+        return Response(content=content, headers=headers, media_type="application/json")
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
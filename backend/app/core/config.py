@@ -1,19 +1,60 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import os
 
+def _to_asyncpg_url(url: str) -> str:
+    """Rewrite a postgres URL to use the asyncpg driver"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL", "")  # Optional read replica
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL_SECONDS", "5"))
+    
+    # Connection pool - by default DB_CONNECTION_BUDGET is split across WEB_CONCURRENCY processes and the engines each one builds
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))  # uvicorn worker processes
+    DB_CONNECTION_BUDGET: int = int(os.getenv("DB_CONNECTION_BUDGET", "30"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "0"))  # 0 = derive from budget
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "-1"))  # -1 = derive from budget
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    
+    # Health prober - background dependency checks served by /readyz
+    # (the DB probe keeps one extra connection per process outside the pool budget)
+    HEALTH_CHECK_INTERVAL_SECONDS: float = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "10"))
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "3"))
+    
+    # Start-up warm-up and graceful shutdown
+    WARM_ON_STARTUP: bool = os.getenv("WARM_ON_STARTUP", "true").lower() == "true"
+    WARM_DB_CONNECTIONS: int = int(os.getenv("WARM_DB_CONNECTIONS", "4"))  # capped at the pool size
+    WARM_REDIS_CONNECTIONS: int = int(os.getenv("WARM_REDIS_CONNECTIONS", "4"))
+    WARM_CATALOG_ROWS: int = int(os.getenv("WARM_CATALOG_ROWS", "100"))
+    WARM_STEP_TIMEOUT_SECONDS: float = float(os.getenv("WARM_STEP_TIMEOUT_SECONDS", "10"))
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", "20"))
     
     # Redis
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))  # Async pool, per process
     
     # Security
     JWT_SECRET_KEY: str
     OTP_SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+    
+    # Authenticated-user cache (in-process LRU backed by Redis)
+    USER_CACHE_LOCAL_TTL_SECONDS: float = float(os.getenv("USER_CACHE_LOCAL_TTL_SECONDS", "30"))
+    USER_CACHE_LOCAL_MAX_ENTRIES: int = int(os.getenv("USER_CACHE_LOCAL_MAX_ENTRIES", "10000"))
+    USER_CACHE_REDIS_TTL_SECONDS: int = int(os.getenv("USER_CACHE_REDIS_TTL_SECONDS", "300"))
+    
+    # Conditional GET - max-age for anonymous catalog responses (authenticated ones are private, no-cache)
+    CATALOG_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("CATALOG_CACHE_MAX_AGE_SECONDS", "30"))
+    RESOURCE_VERSION_TTL_SECONDS: int = int(os.getenv("RESOURCE_VERSION_TTL_SECONDS", "86400"))  # unset versions are reseeded on the next found read
     
     # Environment
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
@@ -27,6 +68,20 @@ class Settings(BaseSettings):
     # Payment
     PAYMENT_PROVIDER: str = "stripe"  # or "paypal", "custom"
     HOLD_TTL_MINUTES: int = 15  # Reservation hold time
+    HOLD_EXPIRY_CHUNK_SIZE: int = int(os.getenv("HOLD_EXPIRY_CHUNK_SIZE", "500"))  # reservations per expiry transaction
+    CART_MAX_SLOTS: int = int(os.getenv("CART_MAX_SLOTS", "8"))  # slots per cart reservation
+    
+    # Booking search
+    AVAILABILITY_SEARCH_MAX_DAYS: int = int(os.getenv("AVAILABILITY_SEARCH_MAX_DAYS", "14"))
+    # Geo search (geohash prefix scan + haversine distance)
+    GEO_DEFAULT_RADIUS_KM: float = float(os.getenv("GEO_DEFAULT_RADIUS_KM", "5"))
+    GEO_MAX_RADIUS_KM: float = float(os.getenv("GEO_MAX_RADIUS_KM", "100"))
+    # Redis availability bitmaps (one bit per time block per court-day)
+    AVAILABILITY_BITMAP_RESOLUTION_MINUTES: int = int(os.getenv("AVAILABILITY_BITMAP_RESOLUTION_MINUTES", "15"))
+    AVAILABILITY_INDEX_DAYS: int = int(os.getenv("AVAILABILITY_INDEX_DAYS", "30"))  # rebuilt ahead of today
+    # Slot generation from weekly templates
+    SLOT_GENERATION_MAX_DAYS: int = int(os.getenv("SLOT_GENERATION_MAX_DAYS", "366"))
+    SLOT_GENERATION_CHUNK_SIZE: int = int(os.getenv("SLOT_GENERATION_CHUNK_SIZE", "5000"))  # rows per INSERT/commit
     STRIPE_SECRET_KEY: str = os.getenv("STRIPE_SECRET_KEY", "")
     STRIPE_WEBHOOK_SECRET: str = os.getenv("STRIPE_WEBHOOK_SECRET", "")
     
@@ -42,6 +97,51 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
+    RATE_LIMIT_WINDOW_SECONDS: float = float(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+    # Requests per window per client, keyed by path prefix (longest prefix wins; JSON in env)
+    RATE_LIMIT_GROUPS: Dict[str, int] = {
+        "/api/v1/auth": int(os.getenv("RATE_LIMIT_PER_MINUTE", "60")),
+        "/api/v1/venues/reservations": 30,
+        "/api/v1": 600,
+    }
+    RATE_LIMIT_LOCAL_MAX_CLIENTS: int = int(os.getenv("RATE_LIMIT_LOCAL_MAX_CLIENTS", "50000"))
+    
+    # Query budget - per-request SQL count/time limits (flagged in logs, not enforced)
+    QUERY_BUDGET_ENABLED: bool = os.getenv("QUERY_BUDGET_ENABLED", "true").lower() == "true"
+    QUERY_BUDGET_MAX_QUERIES: int = int(os.getenv("QUERY_BUDGET_MAX_QUERIES", "10"))
+    QUERY_BUDGET_MAX_DB_MS: float = float(os.getenv("QUERY_BUDGET_MAX_DB_MS", "250"))
+    QUERY_BUDGET_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("QUERY_BUDGET_N_PLUS_ONE_THRESHOLD", "5"))
+    # Per-route overrides keyed by "METHOD /route/template" (JSON in env)
+    QUERY_BUDGET_ROUTES: Dict[str, int] = {
+        "POST /api/v1/venues/reservations": 8,
+        "POST /api/v1/events/organize": 7,
+        "POST /api/v1/matches/{match_id}/events": 7,
+    }
+    
+    # Response compression (zstd/br when installed, gzip always)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+    # Content-Type prefixes never compressed (already compressed or streamed; JSON in env)
+    COMPRESSION_EXCLUDED_TYPES: List[str] = [
+        "application/pdf",
+        "text/event-stream",
+        "application/zip",
+        "application/gzip",
+        "image/",
+        "video/",
+        "audio/",
+    ]
+    PRECOMPRESSED_CACHE_MAX_ENTRIES: int = int(os.getenv("PRECOMPRESSED_CACHE_MAX_ENTRIES", "256"))
+    
+    @property
+    def async_database_url(self) -> str:
+        """DATABASE_URL rewritten for the asyncpg driver"""
+        return _to_asyncpg_url(self.DATABASE_URL)
+    
+    @property
+    def async_replica_url(self) -> str:
+        """DATABASE_REPLICA_URL rewritten for the asyncpg driver (empty if no replica)"""
+        return _to_asyncpg_url(self.DATABASE_REPLICA_URL) if self.DATABASE_REPLICA_URL else ""
     
     @property
     def is_production(self) -> bool:
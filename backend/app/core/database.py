@@ -1,24 +1,174 @@
-from sqlalchemy import create_engine
+import asyncio
+import logging
+import time
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+from app.core.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    pool_sizing,
+    process_pool_status,
 )
+from app.core.query_stats import install_query_hooks
+
+# The per-process connection budget is shared by the engines a process builds:
+# the API builds the async primary (and the replica when configured), the Celery
+# worker and scripts build only the sync engine. Neither builds the other's.
+ASYNC_ENGINE_COUNT = 2 if settings.async_replica_url else 1
+POOL_SIZE, MAX_OVERFLOW = pool_sizing(ASYNC_ENGINE_COUNT)  # per async engine
+
+# Sync engine - used by Celery tasks, Alembic and scripts. Built on first use so
+# API processes never hold a sync pool.
+_sync_engine = {}
+
+def get_sync_engine():
+    """Sync engine and session factory, built on first use"""
+    if not _sync_engine:
+        pool_size, max_overflow = pool_sizing()
+        sync_engine = create_engine(
+            settings.DATABASE_URL,
+            pool_pre_ping=True,
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT
+        )
+        install_query_hooks(sync_engine)
+        _sync_engine["engine"] = sync_engine
+        _sync_engine["SessionLocal"] = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+    return _sync_engine["engine"]
+
+def __getattr__(name: str):
+    # `from app.core.database import engine, SessionLocal` keeps working, lazily
+    if name in ("engine", "SessionLocal"):
+        get_sync_engine()
+        return _sync_engine[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Async engines (asyncpg) - used by the API request handlers. Built on first use
+# (like the async Redis client) so the Celery worker, which only needs the sync
+# engine, never imports asyncpg.
+_async_engines = {}
+
+def _create_async_engine(url: str):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        url,
+        pool_pre_ping=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
+    install_query_hooks(async_engine.sync_engine)
+    # expire_on_commit=False so attributes stay loaded after commit (no implicit IO on access)
+    session_factory = async_sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+    return async_engine, session_factory
+
+def _async(name: str, url: str):
+    if name not in _async_engines:
+        _async_engines[name] = _create_async_engine(url)
+    return _async_engines[name]
+
+def get_async_engine():
+    """Primary async engine"""
+    return _async("primary", settings.async_database_url)[0]
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_replica_engine():
+    """Optional read replica engine - None when DATABASE_REPLICA_URL is unset"""
+    if not settings.async_replica_url:
+        return None
+    return _async("replica", settings.async_replica_url)[0]
+
+def async_session(replica: bool = False):
+    """New async session on the primary, or on the replica (read-only routes)"""
+    if replica:
+        return _async("replica", settings.async_replica_url)[1]()
+    return _async("primary", settings.async_database_url)[1]()
+
+async def dispose_async_engines():
+    """Close every async engine built so far"""
+    for async_engine, _ in _async_engines.values():
+        await async_engine.dispose()
+    _async_engines.clear()
 
 Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+
+# Replication lag in seconds; 0 when caught up, NULL when not a standby
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_replica_state = {"checked_at": 0.0, "usable": False, "lag_seconds": None}
+_replica_check_lock = asyncio.Lock()
+
 def get_db():
-    """Dependency for getting database session"""
-    db = SessionLocal()
+    """Dependency for getting a sync database session (non-async code only)"""
+    get_sync_engine()
+    db = _sync_engine["SessionLocal"]()
     try:
         yield db
     finally:
         db.close()
 
+def pool_metrics() -> dict:
+    """Connection pool usage for this process"""
+    engines = {name: async_engine.sync_engine for name, (async_engine, _) in _async_engines.items()}
+    if _sync_engine:
+        engines["sync"] = _sync_engine["engine"]
+    return process_pool_status(engines)
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with async_session() as db:
+        try:
+            yield db
+        except Exception:
+            # Leave no half-finished transaction on the connection returned to the pool
+            await db.rollback()
+            raise
+
+async def replica_is_usable() -> bool:
+    """Whether the replica is reachable and within REPLICA_MAX_LAG_SECONDS (cached per process)"""
+    replica_engine = get_replica_engine()
+    if replica_engine is None:
+        return False
+    
+    if time.monotonic() - _replica_state["checked_at"] < settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS:
+        return _replica_state["usable"]
+    
+    async with _replica_check_lock:
+        # Another request may have refreshed the state while we waited
+        if time.monotonic() - _replica_state["checked_at"] < settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS:
+            return _replica_state["usable"]
+        
+        try:
+            async with replica_engine.connect() as conn:
+                lag = (await conn.execute(REPLICA_LAG_SQL)).scalar()
+            lag = float(lag or 0)
+            usable = lag <= settings.REPLICA_MAX_LAG_SECONDS
+            if not usable:
+                logger.warning(f"Replica lag {lag:.1f}s exceeds limit, reading from primary")
+        except Exception as e:
+            lag = None
+            usable = False
+            logger.warning(f"Replica unavailable, reading from primary: {e}")
+        
+        _replica_state.update(checked_at=time.monotonic(), usable=usable, lag_seconds=lag)
+        return usable
+
+async def get_async_read_db():
+    """Dependency for read-only routes - uses the replica unless it is missing or lagging"""
+    async with async_session(replica=await replica_is_usable()) as db:
+        yield db
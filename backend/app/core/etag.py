@@ -0,0 +1,97 @@
+from fastapi import HTTPException, Request, status
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.core.redis_client import get_async_redis, redis_client
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# One version per resource scope, e.g. "venues", "courts", "venue:{id}", "addons",
+# "addon:{id}", "formation:{share_token}". Reads never write: a missing version means
+# "no validator yet", and the endpoint seeds it (with a TTL) only once it has found
+# the resource. Writers delete the scopes they touch, so the next reader seeds a
+# fresh value - a flushed or evicted key can never reissue an old ETag.
+
+def _version_key(scope: str) -> str:
+    return f"resource_version:{scope}"
+
+class NotModified(HTTPException):
+    """304 with validator headers; the default handler sends it without a body"""
+
+    def __init__(self, headers: Dict[str, str]):
+        super().__init__(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+async def resource_versions(*scopes: str) -> Optional[List[str]]:
+    """Current version of each scope, or None when any is unset or Redis is unavailable"""
+    try:
+        values = await get_async_redis().mget([_version_key(scope) for scope in scopes])
+    except Exception as e:
+        logger.warning(f"Resource version read failed: {e}")
+        return None
+    if any(value is None for value in values):
+        return None
+    return values
+
+async def seed_versions(*scopes: str):
+    """Give unset scopes a fresh version - call only for resources known to exist"""
+    seed = str(time.time_ns())
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.set(_version_key(scope), seed, nx=True, ex=settings.RESOURCE_VERSION_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Resource version seed failed: {e}")
+
+async def bump_versions(*scopes: str):
+    """Invalidate ETags for the given scopes - call after committing a write"""
+    try:
+        await get_async_redis().delete(*(_version_key(scope) for scope in scopes))
+    except Exception as e:
+        logger.warning(f"Resource version bump failed: {e}")
+
+def bump_versions_sync(*scopes: str):
+    """bump_versions for Celery tasks and scripts"""
+    try:
+        redis_client.delete(*(_version_key(scope) for scope in scopes))
+    except Exception as e:
+        logger.warning(f"Resource version bump failed: {e}")
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+async def conditional_get(request: Request, *scopes: str, max_age: Optional[int] = None) -> Dict[str, str]:
+    """Validator and caching headers for a read endpoint backed by the given scopes.
+
+    Raises NotModified when the client's If-None-Match is still current, before
+    the endpoint touches the database. Sends no ETag until the endpoint has
+    called seed_versions for the scopes.
+    """
+    if request.headers.get("authorization"):
+        headers = {"Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    else:
+        max_age = settings.CATALOG_CACHE_MAX_AGE_SECONDS if max_age is None else max_age
+        headers = {"Cache-Control": f"public, max-age={max_age}" if max_age else "public, no-cache"}
+
+    versions = await resource_versions(*scopes)
+    if versions is None:
+        # Unknown or unseeded resource: no validator, so "*" can't match either
+        return headers
+
+    # Same versions and same URL (filters, cursor, limit) -> byte-identical body
+    digest = hashlib.sha256(
+        "|".join([request.url.path, request.url.query, *versions]).encode()
+    ).hexdigest()[:32]
+    etag = f'"{digest}"'
+    headers["ETag"] = etag
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        raise NotModified(headers)
+    return headers
@@ -0,0 +1,83 @@
+from sqlalchemy import Float, func
+from typing import List, Optional, Tuple
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+# Stored precision - 9 characters is a ~4.8m x 4.8m cell
+GEOHASH_PRECISION = 9
+
+def encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard geohash of a point"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of a cell in degrees"""
+    lat_bits = (5 * precision) // 2
+    lng_bits = 5 * precision - lat_bits
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+def cell_size_km(precision: int, lat: float) -> float:
+    """Smaller side of a cell at this latitude, in km"""
+    height, width = cell_size(precision)
+    return min(height * KM_PER_DEGREE, width * KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+
+def neighborhood(lat: float, lng: float, precision: int) -> List[str]:
+    """The point's cell plus its 8 neighbours - covers every point within one cell size"""
+    height, width = cell_size(precision)
+    cells = []
+    for dlat in (-height, 0.0, height):
+        for dlng in (-width, 0.0, width):
+            cell_lat = min(max(lat + dlat, -90.0), 90.0)
+            cell_lng = (lng + dlng + 180.0) % 360.0 - 180.0
+            cell = encode(cell_lat, cell_lng, precision)
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+def covering_precision(lat: float, radius_km: float) -> Optional[int]:
+    """Finest precision whose 3x3 neighbourhood still covers radius_km (None if too large)"""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        if cell_size_km(precision, lat) >= radius_km:
+            return precision
+    return None
+
+def point_from_location(location: Optional[dict]) -> Optional[Tuple[float, float]]:
+    """(lat, lng) from a location_json value, if it carries usable coordinates"""
+    coordinates = (location or {}).get("coordinates") or {}
+    try:
+        lat, lng = float(coordinates["lat"]), float(coordinates["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        return None
+    return lat, lng
+
+def distance_km_sql(location_column, lat: float, lng: float):
+    """Haversine distance in km from (lat, lng) to location_json coordinates"""
+    venue_lat = func.radians(location_column["coordinates"]["lat"].astext.cast(Float))
+    venue_lng = func.radians(location_column["coordinates"]["lng"].astext.cast(Float))
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    a = (
+        func.power(func.sin((venue_lat - lat1) / 2), 2)
+        + math.cos(lat1) * func.cos(venue_lat) * func.power(func.sin((venue_lng - lng1) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(a, 1.0)))
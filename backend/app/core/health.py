@@ -0,0 +1,121 @@
+from datetime import datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.redis_client import get_async_redis
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Checks that gate readiness; the rest are reported only
+REQUIRED_CHECKS = ("database", "redis")
+
+def _check_broker():
+    """Open (or reuse) a Celery broker connection - blocking, run in the threadpool"""
+    from app.celery_app import celery_app
+    with celery_app.connection_for_write() as conn:
+        conn.ensure_connection(max_retries=1, timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+
+class HealthProber:
+    """Refreshes dependency status in the background; requests only read the snapshot.
+
+    The database probe uses its own single-connection engine, so health traffic
+    never competes with request handlers for pool connections.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.checks: Dict[str, Dict[str, Any]] = {}
+        self.last_run: Optional[float] = None
+        self._engine = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _check_database(self):
+        if self._engine is None:
+            self._engine = create_async_engine(
+                settings.async_database_url,
+                pool_size=1,
+                max_overflow=0,
+                pool_pre_ping=False,
+                pool_recycle=300
+            )
+        async with self._engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _check_redis(self):
+        await get_async_redis().ping()
+
+    async def _check_broker(self):
+        await run_in_threadpool(_check_broker)
+
+    async def _run(self, name: str, check) -> Tuple[str, Dict[str, Any]]:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+            result = {"status": "healthy"}
+        except Exception as e:
+            result = {"status": "unhealthy", "error": str(e) or type(e).__name__}
+            if self.checks.get(name, {}).get("status") != "unhealthy":
+                logger.warning(f"Health check {name} failed: {result['error']}")
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        result["checked_at"] = datetime.now(timezone.utc).isoformat()
+        return name, result
+
+    async def refresh(self):
+        """Run all checks concurrently and replace the snapshot"""
+        results = await asyncio.gather(
+            self._run("database", self._check_database),
+            self._run("redis", self._check_redis),
+            self._run("celery_broker", self._check_broker)
+        )
+        self.checks = dict(results)
+        self.last_run = time.monotonic()
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health prober iteration failed: {e}", exc_info=True)
+
+    async def start(self):
+        """First probe runs inline so readiness is known before serving"""
+        await self.refresh()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cached readiness - stale if the prober stopped refreshing"""
+        age = None if self.last_run is None else time.monotonic() - self.last_run
+        stale = age is None or age > self.interval * 3 + self.timeout
+        ready = not stale and all(
+            self.checks.get(name, {}).get("status") == "healthy" for name in REQUIRED_CHECKS
+        )
+        return {
+            "status": "ready" if ready else "not_ready",
+            "stale": stale,
+            "age_seconds": None if age is None else round(age, 2),
+            "checks": self.checks,
+        }
+
+health_prober = HealthProber(
+    interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS
+)
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from app.core.redis_client import get_async_redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pending reservations are mirrored as hold:{reservation_id} keys that expire at the
+# reservation's expires_at. A release task is queued with the same ETA (one per cart); it
+# releases the holds in Postgres once the keys are gone (or re-queues itself if it ran early).
+# The beat scan in app.tasks.reservations remains as a safety net for lost tasks.
+RELEASE_TASK = "app.tasks.reservations.release_hold"
+
+def hold_key(reservation_id) -> str:
+    return f"hold:{reservation_id}"
+
+def _aware(ts: datetime) -> datetime:
+    """expires_at is written as naive UTC"""
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+async def start_hold(expires_at: datetime, *reservation_ids):
+    """Mirror pending reservations' holds and schedule one release for all of them - call after the commit"""
+    if not reservation_ids:
+        return
+    expires_at = _aware(expires_at)
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            for reservation_id in reservation_ids:
+                pipe.set(hold_key(reservation_id), expires_at.isoformat(), pxat=int(expires_at.timestamp() * 1000))
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Hold mirror write failed for reservations {reservation_ids}: {e}")
+    try:
+        # Enqueue by name - the task module is worker-only; publishing blocks, keep it off the loop.
+        # Imported here: the worker imports this module and must not load FastAPI
+        from fastapi.concurrency import run_in_threadpool
+        from app.celery_app import celery_app
+        await run_in_threadpool(
+            celery_app.send_task, RELEASE_TASK, args=[str(reservation_id) for reservation_id in reservation_ids], eta=expires_at
+        )
+    except Exception as e:
+        logger.warning(f"Hold release scheduling failed for reservations {reservation_ids}: {e}")
+
+async def end_hold(*reservation_ids):
+    """Drop hold mirrors for reservations that were paid or cancelled - call after the commit"""
+    if not reservation_ids:
+        return
+    try:
+        await get_async_redis().delete(*(hold_key(reservation_id) for reservation_id in reservation_ids))
+    except Exception as e:
+        logger.warning(f"Hold mirror delete failed: {e}")
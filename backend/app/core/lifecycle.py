@@ -0,0 +1,65 @@
+from sqlalchemy import select, text
+from app.core.config import settings
+from app.core.database import POOL_SIZE, async_session, get_async_engine, get_replica_engine
+from app.core.etag import seed_versions
+from app.core.redis_client import get_async_redis
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+async def _warm_engine(engine, connections: int):
+    """Open connections concurrently so they sit in the pool before traffic arrives"""
+    async def touch():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    await asyncio.gather(*(touch() for _ in range(connections)))
+
+async def warm_database():
+    connections = min(settings.WARM_DB_CONNECTIONS, POOL_SIZE)
+    await _warm_engine(get_async_engine(), connections)
+    replica_engine = get_replica_engine()
+    if replica_engine is not None:
+        await _warm_engine(replica_engine, connections)
+
+async def warm_redis():
+    redis = get_async_redis()
+    await asyncio.gather(*(redis.ping() for _ in range(settings.WARM_REDIS_CONNECTIONS)))
+
+async def prime_catalog_caches():
+    """Seed catalog ETag versions and run the first-page catalog queries once.
+
+    Compiles and caches the statements (SQLAlchemy and asyncpg) and pulls the
+    catalog pages into Postgres' buffer cache.
+    """
+    from app.api.v1.addons import addon_keyset
+    from app.api.v1.booking import court_keyset, venue_keyset, venue_serializer
+    from app.models.addon import Addon, AddonStatus
+    from app.models.venue import Court
+
+    await seed_versions("venues", "courts", "addons")
+    limit = settings.WARM_CATALOG_ROWS
+    async with async_session() as db:
+        venues = (await db.execute(
+            venue_serializer.select().order_by(*venue_keyset.columns).limit(limit)
+        )).all()
+        venue_ids = [row.id for row in venues]
+        if venue_ids:
+            await seed_versions(*(f"venue:{venue_id}" for venue_id in venue_ids))
+            await db.execute(
+                select(Court).where(Court.venue_id.in_(venue_ids)).order_by(*court_keyset.columns)
+            )
+        await db.execute(
+            select(Addon).where(Addon.status == AddonStatus.ACTIVE).order_by(*addon_keyset.columns).limit(limit)
+        )
+
+async def warm_up():
+    """Pre-warm pools and caches; failures are logged, never fatal"""
+    start = time.perf_counter()
+    for name, step in (("database", warm_database), ("redis", warm_redis), ("catalog", prime_catalog_caches)):
+        try:
+            await asyncio.wait_for(step(), settings.WARM_STEP_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {e!r}")
+    logger.info(f"Warm-up finished in {(time.perf_counter() - start) * 1000:.0f} ms")
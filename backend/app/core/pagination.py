@@ -0,0 +1,76 @@
+from fastapi import HTTPException, Query, status
+from datetime import datetime
+from sqlalchemy import tuple_
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+from app.core.serialization import json_default
+import base64
+import orjson
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+class PageParams:
+    """Dependency for keyset-paginated list endpoints (?cursor=...&limit=...)"""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+def encode_cursor(values) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(list(values), default=json_default)).decode().rstrip("=")
+
+def _parse_value(value, column):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    return python_type(value)
+
+def decode_cursor(cursor: str, columns) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(padded))
+        if len(values) != len(columns):
+            raise ValueError("cursor length mismatch")
+        return tuple(_parse_value(v, c) for v, c in zip(values, columns))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+class Keyset:
+    """Keyset (seek) pagination over (sort key, id) - constant cost per page.
+
+    Needs a composite index on the filter columns followed by the key columns.
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def apply(self, query, page: PageParams):
+        """Add the seek predicate, ordering and limit (fetches one extra row to detect more)"""
+        if page.cursor:
+            after = decode_cursor(page.cursor, self.columns)
+            key = tuple_(*self.columns)
+            query = query.where(key < tuple_(*after) if self.descending else key > tuple_(*after))
+        order = [c.desc() for c in self.columns] if self.descending else list(self.columns)
+        return query.order_by(*order).limit(page.limit + 1)
+
+    def page(self, rows, page: PageParams) -> Tuple[list, Dict[str, str]]:
+        """Trim the extra row; returns the page and the X-Next-Cursor header when there is more"""
+        rows = list(rows)
+        if len(rows) <= page.limit:
+            return rows, {}
+        rows = rows[:page.limit]
+        last = rows[-1]
+        mapping = getattr(last, "_mapping", None)
+        values = [mapping[c.key] if mapping is not None else getattr(last, c.key) for c in self.columns]
+        return rows, {"X-Next-Cursor": encode_cursor(values)}
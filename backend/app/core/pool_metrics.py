@@ -0,0 +1,100 @@
+import math
+import os
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+
+def pool_sizing(engines: int = 1) -> tuple:
+    """Per-engine (pool_size, max_overflow) when a process builds `engines` pools"""
+    if settings.DB_POOL_SIZE > 0:
+        pool_size = settings.DB_POOL_SIZE
+        max_overflow = settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW >= 0 else pool_size
+        return pool_size, max_overflow
+
+    # Split the connection budget across worker processes, then across the
+    # engines each process builds: 2/3 steady, 1/3 burst
+    workers = max(1, settings.WEB_CONCURRENCY)
+    per_engine = max(2, settings.DB_CONNECTION_BUDGET // workers // max(1, engines))
+    pool_size = max(1, math.ceil(per_engine * 2 / 3))
+    max_overflow = settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW >= 0 else per_engine - pool_size
+    return pool_size, max_overflow
+
+class PoolStats:
+    """Checkout counters for one pool (per process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_seconds = 0.0
+        self.wait_max_seconds = 0.0
+
+    def record(self, wait_seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_seconds += wait_seconds
+            self.wait_max_seconds = max(self.wait_max_seconds, wait_seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "checkout_wait_avg_ms": round(self.wait_total_seconds / attempts * 1000, 3) if attempts else 0.0,
+                "checkout_wait_max_ms": round(self.wait_max_seconds * 1000, 3),
+            }
+
+class _InstrumentedPoolMixin:
+    """Times how long each checkout waits for a connection and counts timeouts"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return conn
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_status(pool) -> dict:
+    """In-use/overflow counts plus checkout stats for a pool"""
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "in_use": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": pool._max_overflow,
+    }
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
+
+def process_pool_status(engines: dict) -> dict:
+    """Pool status for every engine in this process"""
+    return {
+        "pid": os.getpid(),
+        "pools": {name: pool_status(engine.pool) for name, engine in engines.items() if engine is not None},
+    }
@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import Counter
+from typing import Optional
+from sqlalchemy import event
+import threading
+import time
+
+class QueryStats:
+    """SQL statements executed within one request (or one counting block)"""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.db_time += elapsed
+        self.statements[statement] += 1
+
+    def repeated_statements(self, threshold: int) -> dict:
+        """Statements executed at least `threshold` times - the N+1 signature"""
+        return {sql: n for sql, n in self.statements.items() if n >= threshold}
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+def start_query_stats() -> QueryStats:
+    """Begin counting queries for the current context"""
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+def _handle_error(context):
+    # after_cursor_execute never fires for a failed statement; drop its start time
+    conn = context.connection
+    if conn is not None and context.execution_context is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+def install_query_hooks(engine):
+    """Attach the query counters to a (sync) engine; use .sync_engine for async engines"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+@contextmanager
+def count_queries():
+    """Count the queries executed inside the block (same thread/task)"""
+    token = _current_stats.set(QueryStats())
+    try:
+        yield _current_stats.get()
+    finally:
+        _current_stats.reset(token)
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """Fail if the block executes more than max_queries statements - for tests"""
+    with count_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        statements = "\n".join(f"  {n}x {sql}" for sql, n in stats.statements.most_common())
+        raise AssertionError(f"Expected at most {max_queries} queries, got {stats.count}:\n{statements}")
+
+class RouteQueryMetrics:
+    """Per-route aggregates of query count and DB time (per process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route: str, stats: QueryStats, over_budget: bool):
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0,
+                "queries": 0,
+                "max_queries": 0,
+                "db_time_ms": 0.0,
+                "over_budget": 0,
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            entry["db_time_ms"] += stats.db_time * 1000
+            if over_budget:
+                entry["over_budget"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                route: {
+                    **entry,
+                    "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                    "avg_db_time_ms": round(entry["db_time_ms"] / entry["requests"], 3),
+                    "db_time_ms": round(entry["db_time_ms"], 3),
+                }
+                for route, entry in self._routes.items()
+            }
+
+route_query_metrics = RouteQueryMetrics()
@@ -1,6 +1,8 @@
 import redis
+import redis.asyncio as aioredis
 from app.core.config import settings
 
+# Sync client - Celery tasks and other non-async code
 redis_client = redis.from_url(
     settings.REDIS_URL,
     decode_responses=True,
@@ -11,3 +13,28 @@ def get_redis():
     """Dependency for getting Redis client"""
     return redis_client
 
+# Async client - request handlers and middleware; opened/closed by the app lifespan
+_async_pool = None
+_async_client = None
+
+def get_async_redis() -> aioredis.Redis:
+    """Dependency for getting the shared async Redis client"""
+    global _async_pool, _async_client
+    if _async_client is None:
+        _async_pool = aioredis.ConnectionPool.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=5,
+            max_connections=settings.REDIS_MAX_CONNECTIONS
+        )
+        _async_client = aioredis.Redis(connection_pool=_async_pool)
+    return _async_client
+
+async def close_async_redis():
+    """Close the async client and disconnect its pool"""
+    global _async_pool, _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        await _async_pool.disconnect()
+        _async_pool = None
+        _async_client = None
@@ -3,10 +3,15 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.cache import LRUCache
+import hashlib
 import secrets
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified claims keyed by token digest; entries expire at the token's exp
+_verified_token_cache = LRUCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -28,12 +33,25 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decode and verify JWT token"""
+    """Decode and verify JWT token (memoized until the token expires)"""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _verified_token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+    
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        _verified_token_cache.set(key, dict(payload), expires_at=exp)
+    return payload
+
+def token_cache_stats() -> dict:
+    """Hit/miss counters for the verified-token cache (per process)"""
+    return _verified_token_cache.stats()
 
 def generate_otp(length: int = 6) -> str:
     """Generate a random OTP"""
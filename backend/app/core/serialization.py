@@ -0,0 +1,42 @@
+from fastapi import Response
+from pydantic import BeforeValidator
+from sqlalchemy import select
+from typing import Annotated, Dict, Optional
+from uuid import UUID
+import orjson
+
+def json_default(value):
+    """orjson fallback - asyncpg returns its own UUID subclass, which orjson does not encode"""
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+# str id field that also accepts the UUID objects ORM rows carry (pydantic v2 does not coerce them)
+StrId = Annotated[str, BeforeValidator(lambda value: str(value) if isinstance(value, UUID) else value)]
+
+class RowSerializer:
+    """Precomputed row -> JSON bytes serializer for a fixed column list.
+
+    Selects plain columns instead of ORM entities and encodes the rows with
+    orjson directly, skipping ORM identity-map work and the response_model
+    re-validation. Keep response_model on the route for the OpenAPI schema; it
+    is not applied when a Response is returned.
+    """
+
+    def __init__(self, *columns):
+        self.columns = columns
+        self.fields = tuple(column.key for column in columns)
+
+    def select(self):
+        return select(*self.columns)
+
+    def dumps(self, rows) -> bytes:
+        fields = self.fields
+        return orjson.dumps([dict(zip(fields, row)) for row in rows], default=json_default)
+
+    def response(self, rows, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+        return Response(content=self.dumps(rows), status_code=status_code, headers=headers, media_type="application/json")
+
+    def one_response(self, row, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+        """A single row as a JSON object"""
+        return Response(content=orjson.dumps(dict(zip(self.fields, row)), default=json_default), status_code=status_code, headers=headers, media_type="application/json")
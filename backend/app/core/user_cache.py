@@ -0,0 +1,151 @@
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from uuid import UUID
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.redis_client import get_async_redis
+from app.models.user import User, UserRole
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Principal(BaseModel):
+    """Lightweight snapshot of the authenticated user"""
+    id: UUID
+    role: UserRole
+    verified_phone: bool
+    verified_email: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            verified_phone=user.verified_phone,
+            verified_email=user.verified_email
+        )
+
+# Level 1: per-process LRU with a short TTL (bounds staleness across workers)
+_local_cache = LRUCache(settings.USER_CACHE_LOCAL_MAX_ENTRIES)
+
+def _redis_key(user_id: UUID) -> str:
+    return f"user_principal:{user_id}"
+
+def _generation_key(user_id: UUID) -> str:
+    return f"user_principal_gen:{user_id}"
+
+# Refill only if no invalidation ran since the reader looked: a reader that loaded
+# the row before a write committed must not put the old snapshot back after the delete
+SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[1]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[3], 'EX', ARGV[2])
+return 1
+"""
+
+async def get_principal(user_id: UUID, db: AsyncSession) -> Optional[Principal]:
+    """Resolve a user snapshot from the local cache, then Redis, then Postgres"""
+    principal = _local_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    # Level 2: shared Redis cache
+    redis = get_async_redis()
+    try:
+        cached, generation = await redis.mget([_redis_key(user_id), _generation_key(user_id)])
+    except Exception as e:
+        logger.warning(f"User cache read failed: {e}")
+        cached, generation = None, None
+
+    if cached:
+        principal = Principal.model_validate_json(cached)
+    else:
+        result = await db.execute(
+            select(User.id, User.role, User.verified_phone, User.verified_email).where(User.id == user_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        principal = Principal(**row._mapping)
+        try:
+            stored = await redis.eval(
+                SET_IF_GENERATION, 2, _generation_key(user_id), _redis_key(user_id),
+                generation or "", settings.USER_CACHE_REDIS_TTL_SECONDS, principal.model_dump_json()
+            )
+            if not stored:
+                # Invalidated while we read - serve this request, cache nothing
+                return principal
+        except Exception as e:
+            logger.warning(f"User cache write failed: {e}")
+
+    _local_cache.set(user_id, principal, ttl_seconds=settings.USER_CACHE_LOCAL_TTL_SECONDS)
+    return principal
+
+# Workers publish invalidations here so every process drops its local copy
+INVALIDATION_CHANNEL = "user_principal:invalidate"
+
+async def invalidate_user(user_id: UUID):
+    """Drop a user's cached snapshot in every worker - call after committing any write to role or verification flags"""
+    _local_cache.delete(user_id)
+    redis = get_async_redis()
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            # New generation first, so in-flight readers' refills are refused
+            pipe.incr(_generation_key(user_id))
+            pipe.expire(_generation_key(user_id), settings.USER_CACHE_REDIS_TTL_SECONDS)
+            pipe.delete(_redis_key(user_id))
+            await pipe.execute()
+        await redis.publish(INVALIDATION_CHANNEL, str(user_id))
+    except Exception as e:
+        logger.warning(f"User cache invalidation failed: {e}")
+
+class InvalidationSubscriber:
+    """Evicts local entries for user ids published on INVALIDATION_CHANNEL.
+
+    Without it another worker would keep serving the old role until its local
+    TTL ran out. Missed messages (e.g. during a reconnect) are still bounded by
+    USER_CACHE_LOCAL_TTL_SECONDS.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def _listen(self):
+        pubsub = get_async_redis().pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    _local_cache.delete(UUID(message["data"]))
+        finally:
+            await pubsub.aclose()
+
+    async def _loop(self):
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"User cache invalidation subscriber failed, reconnecting: {e}")
+                # Entries evicted while disconnected are unknown - start clean
+                _local_cache.clear()
+                await asyncio.sleep(1)
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+invalidation_subscriber = InvalidationSubscriber()
@@ -1,12 +1,20 @@
-from fastapi import FastAPI, Request, status
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from app.core.config import settings
+from app.core.database import dispose_async_engines
+from app.core.redis_client import get_async_redis, close_async_redis
+from app.core.health import health_prober
+from app.core.lifecycle import warm_up
+from app.core.user_cache import invalidation_subscriber
 from app.api.v1.router import api_router
 from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.query_budget import QueryBudgetMiddleware
+from app.middleware.request_context import RequestContextMiddleware, request_tracker
+from app.middleware.compression import CompressionMiddleware
+from contextlib import asynccontextmanager
 import logging
-import time
 
 # Configure logging
 logging.basicConfig(
@@ -15,47 +23,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="Mosab Sport API",
-    description="Sports platform for booking, match management, and reporting",
-    version="1.0.0",
-    docs_url="/docs" if settings.is_development else None,
-    redoc_url="/redoc" if settings.is_development else None,
-    openapi_url="/openapi.json" if settings.is_development else None
-)
-
-# CORS middleware - restricted in production
-allowed_methods = ["GET", "POST", "PUT", "DELETE", "OPTIONS"] if settings.is_production else ["*"]
-allowed_headers = ["Content-Type", "Authorization", "Idempotency-Key"] if settings.is_production else ["*"]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=allowed_methods,
-    allow_headers=allowed_headers,
-    expose_headers=["X-Request-ID"],
-)
-
-# Add rate limiting middleware
-if settings.RATE_LIMIT_ENABLED:
-    app.add_middleware(RateLimitMiddleware)
-
-# Include API routes
-app.include_router(api_router, prefix="/api/v1")
-
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add request ID and process time"""
-    start_time = time.time()
-    request_id = request.headers.get("X-Request-ID", f"req-{int(time.time() * 1000)}")
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    response.headers["X-Request-ID"] = request_id
-    return response
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the shared pools and clients: warm them before serving, drain and close on shutdown"""
+    get_async_redis()
+    await health_prober.start()
+    invalidation_subscriber.start()
+    if settings.WARM_ON_STARTUP:
+        await warm_up()
+    
+    yield
+    
+    # Uvicorn has already closed its listeners (readiness cannot be flipped from here) and
+    # waited up to --timeout-graceful-shutdown; don't close the pools under stragglers
+    if not await request_tracker.drain(settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS):
+        logger.warning(f"Shutdown drain timed out with {request_tracker.active} requests in flight")
+    await invalidation_subscriber.stop()
+    await health_prober.stop()
+    await close_async_redis()
+    await dispose_async_engines()
 
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors without exposing internal details"""
     logger.warning(f"Validation error: {exc.errors()}")
@@ -64,7 +51,6 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={"detail": "Validation error", "errors": exc.errors()}
     )
 
-@app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected errors"""
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
@@ -75,41 +61,54 @@ async def general_exception_handler(request: Request, exc: Exception):
         content={"detail": detail}
     )
 
-@app.get("/health")
+# Health, metrics and root endpoints
+system_router = APIRouter()
+
+@system_router.get("/livez")
+async def liveness_check():
+    """Liveness - the process is serving requests; never touches dependencies"""
+    return {"status": "alive"}
+
+@system_router.get("/readyz")
+async def readiness_check():
+    """Readiness - cached dependency status from the background prober"""
+    snapshot = health_prober.snapshot()
+    status_code = 200 if snapshot["status"] == "ready" else 503
+    return JSONResponse(content=snapshot, status_code=status_code)
+
+@system_router.get("/health")
 async def health_check():
-    """Health check endpoint with dependency checks"""
-    from app.core.database import engine
-    from app.core.redis_client import redis_client
-    
+    """Health check endpoint with dependency checks (cached, see /readyz)"""
+    snapshot = health_prober.snapshot()
     health_status = {
-        "status": "healthy",
+        "status": "healthy" if snapshot["status"] == "ready" else "degraded",
         "service": "mosab-sport-api",
         "version": "1.0.0",
         "environment": settings.ENVIRONMENT,
-        "checks": {}
+        "checks": snapshot["checks"]
     }
-    
-    # Check database
-    try:
-        with engine.connect() as conn:
-            conn.execute("SELECT 1")
-        health_status["checks"]["database"] = "healthy"
-    except Exception as e:
-        health_status["checks"]["database"] = f"unhealthy: {str(e)}"
-        health_status["status"] = "degraded"
-    
-    # Check Redis
-    try:
-        redis_client.ping()
-        health_status["checks"]["redis"] = "healthy"
-    except Exception as e:
-        health_status["checks"]["redis"] = f"unhealthy: {str(e)}"
-        health_status["status"] = "degraded"
-    
     status_code = 200 if health_status["status"] == "healthy" else 503
     return JSONResponse(content=health_status, status_code=status_code)
 
-@app.get("/")
+@system_router.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Connection pool usage for this worker process"""
+    from app.core.database import pool_metrics
+    return pool_metrics()
+
+@system_router.get("/metrics/queries")
+async def query_metrics():
+    """Per-route query counts and DB time for this worker process"""
+    from app.core.query_stats import route_query_metrics
+    return route_query_metrics.snapshot()
+
+@system_router.get("/metrics/auth-cache")
+async def auth_cache_metrics():
+    """Verified-token cache hit/miss counters for this worker process"""
+    from app.core.security import token_cache_stats
+    return {"token_cache": token_cache_stats()}
+
+@system_router.get("/")
 async def root():
     return {
         "message": "Mosab Sport API",
@@ -117,3 +116,53 @@ async def root():
         "health": "/health"
     }
 
+def create_app() -> FastAPI:
+    """Build the API application (uvicorn app.main:app, or --factory app.main:create_app)"""
+    app = FastAPI(
+        lifespan=lifespan,
+        title="Mosab Sport API",
+        description="Sports platform for booking, match management, and reporting",
+        version="1.0.0",
+        docs_url="/docs" if settings.is_development else None,
+        redoc_url="/redoc" if settings.is_development else None,
+        openapi_url="/openapi.json" if settings.is_development else None
+    )
+    
+    # CORS middleware - restricted in production
+    allowed_methods = ["GET", "POST", "PUT", "DELETE", "OPTIONS"] if settings.is_production else ["*"]
+    allowed_headers = ["Content-Type", "Authorization", "Idempotency-Key", "If-None-Match"] if settings.is_production else ["*"]
+    
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=allowed_methods,
+        allow_headers=allowed_headers,
+        expose_headers=["X-Request-ID", "X-Query-Count", "X-DB-Time-Ms", "X-Next-Cursor", "ETag"],
+    )
+    
+    # Add rate limiting middleware
+    if settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(RateLimitMiddleware)
+    
+    # Per-request SQL query counting / N+1 detection
+    if settings.QUERY_BUDGET_ENABLED:
+        app.add_middleware(QueryBudgetMiddleware)
+    
+    # Negotiated response compression (inside the timing/request-id layer)
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+    
+    # Request ID / process time headers, in-flight tracking (outermost)
+    app.add_middleware(RequestContextMiddleware)
+    
+    # Include API routes
+    app.include_router(api_router, prefix="/api/v1")
+    app.include_router(system_router)
+    
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(Exception, general_exception_handler)
+    
+    return app
+
+app = create_app()
@@ -0,0 +1,60 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.compression import DYNAMIC_LEVELS, compress_async, is_excluded, negotiate
+from app.middleware.request_context import get_header
+
+class CompressionMiddleware:
+    """Negotiated zstd/br/gzip response compression (pure ASGI).
+
+    Only single-message bodies of at least minimum_size bytes are compressed;
+    streamed responses, excluded media types and bodies that already carry a
+    Content-Encoding pass through unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        encoding = negotiate(get_header(scope, b"accept-encoding")) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or is_excluded(headers.get("content-type"))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await compress_async(body, encoding, DYNAMIC_LEVELS[encoding])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            # The encoded bytes differ from the identity body, so the validator is weak
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,58 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.query_stats import start_query_stats, route_query_metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+def route_key(scope: Scope) -> str:
+    """'METHOD /path/{template}' for the matched route, raw path otherwise"""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope["path"]
+    return f"{scope['method']} {path}"
+
+class QueryBudgetMiddleware:
+    """Count SQL queries and DB time per request and flag requests over budget (pure ASGI)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_query_stats()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Query-Count"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.db_time * 1000:.1f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._check_budget(scope, stats)
+
+    def _check_budget(self, scope: Scope, stats):
+        key = route_key(scope)
+        max_queries = settings.QUERY_BUDGET_ROUTES.get(key, settings.QUERY_BUDGET_MAX_QUERIES)
+        db_time_ms = stats.db_time * 1000
+        over_budget = stats.count > max_queries or db_time_ms > settings.QUERY_BUDGET_MAX_DB_MS
+
+        if over_budget:
+            logger.warning(
+                f"Query budget exceeded on {key}: {stats.count} queries "
+                f"(budget {max_queries}), {db_time_ms:.1f}ms DB time"
+            )
+
+        repeated = stats.repeated_statements(settings.QUERY_BUDGET_N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            logger.warning(f"Possible N+1 on {key}: " + "; ".join(
+                f"{n}x {sql[:120]}" for sql, n in repeated.items()
+            ))
+
+        route_query_metrics.record(key, stats, over_budget)
@@ -1,40 +1,127 @@
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from app.core.redis_client import get_redis
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Optional, Tuple
+from app.core.cache import LRUCache
+from app.core.redis_client import get_async_redis
 from app.core.config import settings
+import logging
+import math
 import time
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware using Redis"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting if disabled
-        if not settings.RATE_LIMIT_ENABLED:
-            return await call_next(request)
-        
-        # Only rate limit auth endpoints
-        if request.url.path.startswith("/api/v1/auth"):
-            redis = get_redis()
-            client_ip = request.client.host if request.client else "unknown"
-            endpoint = request.url.path
-            
-            # Create rate limit key
-            key = f"rate_limit:{client_ip}:{endpoint}"
-            
-            # Get current count
-            current = redis.get(key)
-            
-            if current and int(current) >= settings.RATE_LIMIT_PER_MINUTE:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Rate limit exceeded. Please try again later."
-                )
-            
-            # Increment counter
-            pipe = redis.pipeline()
-            pipe.incr(key)
-            pipe.expire(key, 60)  # 1 minute window
-            pipe.execute()
-        
-        return await call_next(request)
+logger = logging.getLogger(__name__)
 
+# GCRA limiter: one key per client+group holding the theoretical arrival time (ms).
+# Uses the Redis clock so API hosts with skewed clocks agree.
+# Returns {allowed, retry_after_ms}.
+GCRA_LUA = """
+local now_parts = redis.call('TIME')
+local now = now_parts[1] * 1000 + math.floor(now_parts[2] / 1000)
+local emission = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + emission
+local allow_at = new_tat - burst
+if allow_at > now then
+    return {0, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, 0}
+"""
+
+_gcra_script = None
+
+def match_group(path: str) -> Optional[Tuple[str, int]]:
+    """Longest RATE_LIMIT_GROUPS prefix matching the path, with its per-window limit"""
+    best = None
+    for prefix, limit in settings.RATE_LIMIT_GROUPS.items():
+        if path.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, limit)
+    return best
+
+class LocalTokenBucket:
+    """Per-process token buckets with the same rate as the shared limit.
+
+    A single process only sees part of a client's traffic, so an empty local
+    bucket means the client is over the shared limit too - reject it without
+    asking Redis.
+    """
+
+    def __init__(self, max_clients: int):
+        self._buckets = LRUCache(max_clients)
+
+    def take(self, key: str, limit: int, window: float) -> bool:
+        now = time.monotonic()
+        rate = limit / window
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(limit), now]
+        tokens = min(float(limit), bucket[0] + (now - bucket[1]) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        bucket[0], bucket[1] = tokens, now
+        self._buckets.set(key, bucket, ttl_seconds=window)
+        return allowed
+
+    def refund(self, key: str, limit: int):
+        """Give a token back when the shared limiter rejected the request"""
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket[0] = min(float(limit), bucket[0] + 1)
+
+async def _check_redis(key: str, limit: int, window: float) -> Tuple[bool, float]:
+    """Single EVALSHA round trip to the shared GCRA limiter"""
+    global _gcra_script
+    redis = get_async_redis()
+    if _gcra_script is None or _gcra_script.registered_client is not redis:
+        _gcra_script = redis.register_script(GCRA_LUA)
+    emission_ms = window * 1000 / limit
+    allowed, retry_after_ms = await _gcra_script(keys=[key], args=[emission_ms, emission_ms * limit])
+    return bool(allowed), float(retry_after_ms) / 1000
+
+class RateLimitMiddleware:
+    """Rate limiting middleware - local token bucket pre-check plus shared GCRA in Redis (pure ASGI)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.local = LocalTokenBucket(settings.RATE_LIMIT_LOCAL_MAX_CLIENTS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        group = match_group(scope["path"]) if scope["type"] == "http" and settings.RATE_LIMIT_ENABLED else None
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        prefix, limit = group
+        window = settings.RATE_LIMIT_WINDOW_SECONDS
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        key = f"rate_limit:{prefix}:{client_ip}"
+
+        if not self.local.take(key, limit, window):
+            await self._reject(scope, receive, send, window / limit)
+            return
+
+        try:
+            allowed, retry_after = await _check_redis(key, limit, window)
+        except Exception as e:
+            # Fail open - the local bucket still caps each process
+            logger.warning(f"Rate limiter unavailable: {e}")
+            allowed, retry_after = True, 0.0
+
+        if not allowed:
+            self.local.refund(key, limit)
+            await self._reject(scope, receive, send, retry_after)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, retry_after: float):
+        response = JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "Rate limit exceeded. Please try again later."},
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+        await response(scope, receive, send)
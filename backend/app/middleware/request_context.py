@@ -0,0 +1,71 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+import asyncio
+import time
+
+def get_header(scope: Scope, name: bytes):
+    """Read a request header straight from the ASGI scope (name must be lowercase)"""
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+class RequestTracker:
+    """Counts in-flight HTTP requests so shutdown can wait for them to finish"""
+
+    def __init__(self):
+        self.active = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    def _event(self) -> asyncio.Event:
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            self._idle.set()
+        return self._idle
+
+    def started(self):
+        self.active += 1
+        self._event().clear()
+
+    def finished(self):
+        self.active -= 1
+        if self.active == 0:
+            self._event().set()
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait for in-flight requests to finish; False on timeout"""
+        try:
+            await asyncio.wait_for(self._event().wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+request_tracker = RequestTracker()
+
+class RequestContextMiddleware:
+    """Add X-Request-ID and X-Process-Time headers and track in-flight requests (pure ASGI)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        request_id = get_header(scope, b"x-request-id") or f"req-{int(time.time() * 1000)}"
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+                headers["X-Request-ID"] = request_id
+            await send(message)
+
+        request_tracker.started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_tracker.finished()
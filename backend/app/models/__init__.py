@@ -1,6 +1,6 @@
 # Models module
 from app.models.user import User
-from app.models.venue import Venue, Court, Slot
+from app.models.venue import Venue, Court, Slot, SlotTemplate
 from app.models.booking import Reservation, RecurrencePattern
 from app.models.payment import Payment, PaymentEvent
 from app.models.match import Match, RefereeAssignment, MatchEvent, MatchReport, MatchFormat
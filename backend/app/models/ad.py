@@ -36,7 +36,7 @@ class Advertiser(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     contact_json = Column(JSONB, nullable=False)  # {email, phone, address}
-    status = Column(SQLEnum(AdvertiserStatus), default=AdvertiserStatus.ACTIVE, nullable=False)
+    status = Column(SQLEnum(AdvertiserStatus, native_enum=False), default=AdvertiserStatus.ACTIVE, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 class AdCreative(Base):
@@ -46,7 +46,7 @@ class AdCreative(Base):
     advertiser_id = Column(UUID(as_uuid=True), ForeignKey("advertisers.id"), nullable=False)
     media_url = Column(String(500), nullable=False)
     copy = Column(String(1000), nullable=True)  # Ad text/copy
-    status = Column(SQLEnum(AdCreativeStatus), default=AdCreativeStatus.DRAFT, nullable=False)
+    status = Column(SQLEnum(AdCreativeStatus, native_enum=False), default=AdCreativeStatus.DRAFT, nullable=False)
     submitted_at = Column(DateTime(timezone=True), nullable=True)
     decided_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     decided_at = Column(DateTime(timezone=True), nullable=True)
@@ -60,9 +60,9 @@ class AdPlacement(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     match_id = Column(UUID(as_uuid=True), ForeignKey("matches.id"), nullable=False)
-    slot = Column(SQLEnum(AdPlacementSlot), nullable=False)
+    slot = Column(SQLEnum(AdPlacementSlot, native_enum=False), nullable=False)
     creative_id = Column(UUID(as_uuid=True), ForeignKey("ad_creatives.id"), nullable=False)
-    status = Column(SQLEnum(AdPlacementStatus), default=AdPlacementStatus.SCHEDULED, nullable=False)
+    status = Column(SQLEnum(AdPlacementStatus, native_enum=False), default=AdPlacementStatus.SCHEDULED, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     creative = relationship("AdCreative", back_populates="placements")
@@ -23,14 +23,14 @@ class Addon(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     description = Column(String(500), nullable=True)
-    category = Column(SQLEnum(AddonCategory), nullable=False)
+    category = Column(SQLEnum(AddonCategory, native_enum=False), nullable=False)
     
     # Pricing
     price_cents = Column(Integer, nullable=False)
     currency = Column(String(3), default="USD", nullable=False)
     
     # Availability
-    status = Column(SQLEnum(AddonStatus), default=AddonStatus.ACTIVE, nullable=False)
+    status = Column(SQLEnum(AddonStatus, native_enum=False), default=AddonStatus.ACTIVE, nullable=False)
     is_custom = Column(Boolean, default=False, nullable=False)  # For custom add-ons
     
     # Metadata
@@ -43,5 +43,6 @@ class Addon(Base):
         UniqueConstraint("name", name="uq_addon_name"),
         Index("idx_addon_category", "category"),
         Index("idx_addon_status", "status"),
+        Index("idx_addon_status_name_id", "status", "name", "id"),
     )
 
@@ -15,7 +15,7 @@ class MatchAward(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     match_id = Column(UUID(as_uuid=True), ForeignKey("matches.id"), nullable=False)
-    kind = Column(SQLEnum(AwardKind), nullable=False)
+    kind = Column(SQLEnum(AwardKind, native_enum=False), nullable=False)
     winner_ref = Column(String(255), nullable=False)  # player_id or event_id
     decided_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     decided_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
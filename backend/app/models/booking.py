@@ -29,14 +29,15 @@ class Reservation(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     slot_id = Column(UUID(as_uuid=True), ForeignKey("slots.id"), nullable=True)  # Nullable for own court
     booked_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    actor_type = Column(SQLEnum(ActorType), nullable=False)
+    actor_type = Column(SQLEnum(ActorType, native_enum=False), nullable=False)
     actor_id = Column(String(255), nullable=True)  # Optional: company/school/academy ID
-    status = Column(SQLEnum(ReservationStatus), default=ReservationStatus.PENDING, nullable=False)
+    status = Column(SQLEnum(ReservationStatus, native_enum=False), default=ReservationStatus.PENDING, nullable=False)
     payment_id = Column(UUID(as_uuid=True), ForeignKey("payments.id"), nullable=True)
+    cart_id = Column(UUID(as_uuid=True), nullable=True)  # Shared by reservations held and paid together
     
     # Recurring events support
     is_recurring = Column(Boolean, default=False, nullable=False)
-    recurrence_pattern = Column(SQLEnum(RecurrencePattern), nullable=True)
+    recurrence_pattern = Column(SQLEnum(RecurrencePattern, native_enum=False), nullable=True)
     recurrence_end_date = Column(DateTime(timezone=True), nullable=True)
     
     # Own court option
@@ -49,7 +50,11 @@ class Reservation(Base):
     slot = relationship("Slot", back_populates="reservation")
     match = relationship("Match", back_populates="reservation", uselist=False)
     
-    # Note: Partial unique constraint for paid reservations is enforced at application level
-    # Database-level partial unique constraints require PostgreSQL 9.2+ and specific syntax
-    # For now, we enforce this in the application logic
+    __table_args__ = (
+        Index("idx_reservation_cart", "cart_id", postgresql_where=(cart_id.isnot(None))),
+        # At most one paid reservation per slot - the double-booking guarantee
+        Index("uq_reservation_paid_slot", "slot_id", unique=True, postgresql_where=(status == ReservationStatus.PAID)),
+        Index("idx_reservation_user_created_id", "booked_by_user_id", "created_at", "id"),
+        Index("idx_reservation_pending_expires", "expires_at", postgresql_where=(status == ReservationStatus.PENDING)),
+    )
 
@@ -38,18 +38,18 @@ class Event(Base):
     sport = Column(String(50), nullable=False)  # football, basketball, etc.
     
     # Step 2: Match Format
-    match_format = Column(SQLEnum(MatchFormat), nullable=False)
+    match_format = Column(SQLEnum(MatchFormat, native_enum=False), nullable=False)
     players_per_team = Column(Integer, nullable=False)  # Calculated from format
     total_players = Column(Integer, nullable=False)  # players_per_team * 2
     
     # Step 3: Event Type
-    event_type = Column(SQLEnum(EventType), nullable=False)
+    event_type = Column(SQLEnum(EventType, native_enum=False), nullable=False)
     
     # Step 4: Event Details
     event_date = Column(DateTime(timezone=True), nullable=False)
     event_time = Column(String(10), nullable=True)  # "HH:MM" format
     is_recurring = Column(Boolean, default=False, nullable=False)
-    recurrence_pattern = Column(SQLEnum(RecurrencePattern), nullable=True)
+    recurrence_pattern = Column(SQLEnum(RecurrencePattern, native_enum=False), nullable=True)
     recurrence_end_date = Column(DateTime(timezone=True), nullable=True)
     
     # Court/Venue Selection
@@ -67,7 +67,7 @@ class Event(Base):
     selected_addons_json = Column(JSONB, nullable=True)  # Array of addon IDs
     
     # Step 8: Review & Submit
-    status = Column(SQLEnum(EventStatus), default=EventStatus.DRAFT, nullable=False)
+    status = Column(SQLEnum(EventStatus, native_enum=False), default=EventStatus.DRAFT, nullable=False)
     total_cost_cents = Column(Integer, nullable=True)  # Court booking + add-ons
     currency = Column(String(3), default="USD", nullable=False)
     
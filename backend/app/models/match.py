@@ -40,7 +40,7 @@ class Match(Base):
     sport = Column(String(50), nullable=False)
     
     # Match format and player count
-    match_format = Column(SQLEnum(MatchFormat), nullable=True)  # 5x5, 8x8, etc.
+    match_format = Column(SQLEnum(MatchFormat, native_enum=False), nullable=True)  # 5x5, 8x8, etc.
     players_per_team = Column(Integer, nullable=True)  # Number of players per team
     total_players = Column(Integer, nullable=True)  # Total players (players_per_team * 2)
     
@@ -48,7 +48,7 @@ class Match(Base):
     is_public = Column(Boolean, default=False, nullable=False)
     spots_available = Column(Integer, nullable=True)  # For public matches
     
-    status = Column(SQLEnum(MatchStatus), default=MatchStatus.SCHEDULED, nullable=False)
+    status = Column(SQLEnum(MatchStatus, native_enum=False), default=MatchStatus.SCHEDULED, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     started_at = Column(DateTime(timezone=True), nullable=True)
     finalized_at = Column(DateTime(timezone=True), nullable=True)
@@ -65,9 +65,11 @@ class RefereeAssignment(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     match_id = Column(UUID(as_uuid=True), ForeignKey("matches.id"), nullable=False)
     referee_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    status = Column(SQLEnum(RefereeAssignmentStatus), default=RefereeAssignmentStatus.OFFERED, nullable=False)
+    status = Column(SQLEnum(RefereeAssignmentStatus, native_enum=False), default=RefereeAssignmentStatus.OFFERED, nullable=False)
     offered_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     responded_at = Column(DateTime(timezone=True), nullable=True)
+    
+    match = relationship("Match", back_populates="referee_assignments")
 
 class MatchEvent(Base):
     __tablename__ = "match_events"
@@ -94,7 +96,7 @@ class MatchReport(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     match_id = Column(UUID(as_uuid=True), ForeignKey("matches.id"), nullable=False)
     version = Column(Integer, default=1, nullable=False)
-    status = Column(SQLEnum(ReportStatus), default=ReportStatus.GENERATING, nullable=False)
+    status = Column(SQLEnum(ReportStatus, native_enum=False), default=ReportStatus.GENERATING, nullable=False)
     pdf_url = Column(String(500), nullable=True)
     checksum = Column(String(64), nullable=True)  # SHA256 checksum
     report_json = Column(JSONB, nullable=True)  # Canonical report data
@@ -11,6 +11,7 @@ class PaymentStatus(str, enum.Enum):
     AUTHORIZED = "authorized"
     CAPTURED = "captured"
     FAILED = "failed"
+    REFUND_PENDING = "refund_pending"  # captured, but its slot was already paid for
     REFUNDED = "refunded"
 
 class Payment(Base):
@@ -21,12 +22,12 @@ class Payment(Base):
     provider_ref = Column(String(255), nullable=True)  # External payment reference
     amount_cents = Column(Integer, nullable=False)
     currency = Column(String(3), default="USD", nullable=False)
-    status = Column(SQLEnum(PaymentStatus), default=PaymentStatus.INITIATED, nullable=False)
+    status = Column(SQLEnum(PaymentStatus, native_enum=False), default=PaymentStatus.INITIATED, nullable=False)
     reservation_id = Column(UUID(as_uuid=True), ForeignKey("reservations.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    reservation = relationship("Reservation", backref="payment")
+    reservation = relationship("Reservation", foreign_keys=[reservation_id], backref="payment")
     events = relationship("PaymentEvent", back_populates="payment")
 
 class PaymentEvent(Base):
@@ -20,7 +20,7 @@ class User(Base):
     phone = Column(String(20), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=True, index=True)
     name = Column(String(255), nullable=False)
-    role = Column(SQLEnum(UserRole), default=UserRole.ORGANIZER, nullable=False)
+    role = Column(SQLEnum(UserRole, native_enum=False), default=UserRole.ORGANIZER, nullable=False)
     verified_phone = Column(Boolean, default=False, nullable=False)
     verified_email = Column(Boolean, default=False, nullable=False)
     
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, Integer, Numeric, DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint, Index
+from sqlalchemy import Column, String, Text, Integer, Numeric, DateTime, Time, ForeignKey, Enum as SQLEnum, UniqueConstraint, Index, Computed, event
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 import enum
 from app.core.database import Base
+from app.core.geo import encode as geohash_encode, point_from_location
 
 class SlotStatus(str, enum.Enum):
     OPEN = "open"
@@ -17,11 +18,31 @@ class Venue(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     location_json = Column(JSONB, nullable=False)  # {address, city, coordinates: {lat, lng}}
+    geohash = Column(String(12), nullable=True)  # Derived from location_json coordinates
+    # Lower-cased name + address + city for trigram search (generated by Postgres)
+    search_text = Column(Text, Computed(
+        "lower(coalesce(name, '') || ' ' || coalesce(location_json->>'address', '') || ' ' "
+        "|| coalesce(location_json->>'city', ''))",
+        persisted=True
+    ))
     owner_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     policies_json = Column(JSONB, default={})  # {cancellation_policy, refund_policy, etc}
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     courts = relationship("Court", back_populates="venue", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("idx_venue_name_id", "name", "id"),
+        Index("idx_venue_geohash", "geohash", postgresql_ops={"geohash": "varchar_pattern_ops"}),
+        Index("idx_venue_search_trgm", "search_text", postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"}),
+    )
+
+@event.listens_for(Venue, "before_insert")
+@event.listens_for(Venue, "before_update")
+def set_venue_geohash(mapper, connection, venue):
+    """Keep the geohash column in step with location_json coordinates"""
+    point = point_from_location(venue.location_json)
+    venue.geohash = geohash_encode(*point) if point else None
 
 class Court(Base):
     __tablename__ = "courts"
@@ -35,6 +56,11 @@ class Court(Base):
     
     venue = relationship("Venue", back_populates="courts")
     slots = relationship("Slot", back_populates="court", cascade="all, delete-orphan")
+    slot_templates = relationship("SlotTemplate", back_populates="court", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("idx_court_venue_name_id", "venue_id", "name", "id"),
+    )
 
 class Slot(Base):
     __tablename__ = "slots"
@@ -45,7 +71,7 @@ class Slot(Base):
     end_ts = Column(DateTime(timezone=True), nullable=False)
     price_cents = Column(Integer, nullable=False)
     currency = Column(String(3), default="USD", nullable=False)
-    status = Column(SQLEnum(SlotStatus), default=SlotStatus.OPEN, nullable=False)
+    status = Column(SQLEnum(SlotStatus, native_enum=False), default=SlotStatus.OPEN, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     court = relationship("Court", back_populates="slots")
@@ -55,5 +81,28 @@ class Slot(Base):
         UniqueConstraint("court_id", "start_ts", "end_ts", name="uq_slot_court_time"),
         Index("idx_slot_court_status", "court_id", "status"),
         Index("idx_slot_time_range", "start_ts", "end_ts"),
+        Index("idx_slot_court_start_id", "court_id", "start_ts", "id"),
+        Index("idx_slot_status_start", "status", "start_ts"),
     )
 
+class SlotTemplate(Base):
+    """One price band of a court's weekly schedule, expanded into Slot rows by a Celery task"""
+    __tablename__ = "slot_templates"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    court_id = Column(UUID(as_uuid=True), ForeignKey("courts.id"), nullable=False)
+    weekday = Column(Integer, nullable=False)  # 0 = Monday ... 6 = Sunday
+    start_time = Column(Time, nullable=False)  # Venue-local wall clock
+    end_time = Column(Time, nullable=False)  # 00:00 = midnight at the end of the day
+    slot_minutes = Column(Integer, nullable=False)
+    price_cents = Column(Integer, nullable=False)
+    currency = Column(String(3), default="USD", nullable=False)
+    timezone = Column(String(64), default="UTC", nullable=False)  # IANA name, e.g. Europe/Paris
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    court = relationship("Court", back_populates="slot_templates")
+    
+    __table_args__ = (
+        UniqueConstraint("court_id", "weekday", "start_time", name="uq_slot_template_band"),
+        Index("idx_slot_template_court", "court_id"),
+    )
@@ -48,8 +48,8 @@ class Transaction(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     wallet_id = Column(UUID(as_uuid=True), ForeignKey("wallets.id"), nullable=False)
-    type = Column(SQLEnum(TransactionType), nullable=False)
-    status = Column(SQLEnum(TransactionStatus), default=TransactionStatus.PENDING, nullable=False)
+    type = Column(SQLEnum(TransactionType, native_enum=False), nullable=False)
+    status = Column(SQLEnum(TransactionStatus, native_enum=False), default=TransactionStatus.PENDING, nullable=False)
     
     amount_cents = Column(Integer, nullable=False)  # Positive for deposit/earned, negative for withdrawal/payment
     currency = Column(String(3), default="USD", nullable=False)
@@ -77,7 +77,7 @@ class PaymentMethod(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     wallet_id = Column(UUID(as_uuid=True), ForeignKey("wallets.id"), nullable=False)
-    type = Column(SQLEnum(PaymentMethodType), nullable=False)
+    type = Column(SQLEnum(PaymentMethodType, native_enum=False), nullable=False)
     
     # Masked card/account info
     last_four = Column(String(4), nullable=True)  # Last 4 digits
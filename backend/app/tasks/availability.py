@@ -0,0 +1,21 @@
+from celery import shared_task
+from app.core.database import SessionLocal
+from app.core.availability import rebuild_index
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+@shared_task
+def reconcile_availability_index():
+    """Rebuild the slot availability bitmaps from Postgres to repair drift"""
+    db = SessionLocal()
+    try:
+        stats = rebuild_index(db, settings.AVAILABILITY_INDEX_DAYS)
+        logger.info(f"Availability index rebuilt: {stats}")
+        return stats
+    except Exception as e:
+        logger.error(f"Error rebuilding availability index: {e}")
+        return {"error": str(e)}
+    finally:
+        db.close()
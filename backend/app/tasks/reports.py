@@ -4,9 +4,6 @@ from app.core.database import SessionLocal
 from app.models.match import Match, MatchEvent, MatchReport, ReportStatus
 from app.models.booking import Reservation
 from app.models.venue import Venue, Court, Slot
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
 import hashlib
 import json
 import os
@@ -158,6 +155,10 @@ def generate_match_report_task(match_id: str, version: int = None):
 
 def generate_pdf(report_data: dict, output_path: str):
     """Generate PDF from report data"""
+    # reportlab is only needed here - keep it out of worker start-up
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    
     c = canvas.Canvas(output_path, pagesize=letter)
     width, height = letter
     
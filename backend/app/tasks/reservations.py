@@ -1,45 +1,143 @@
 from celery import shared_task
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.core.holds import hold_key
 from app.models.booking import Reservation, ReservationStatus
 from app.models.venue import Slot, SlotStatus
-from datetime import datetime
+from app.core.availability import mark_slots_sync
+from datetime import datetime, timezone
+import time
+import uuid
 
-@shared_task
-def expire_pending_reservations():
-    """Expire pending reservations that have passed their TTL"""
+def _naive_utc(ts: datetime) -> datetime:
+    return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo is not None else ts
+
+@shared_task(bind=True)
+def release_hold(self, *reservation_ids: str):
+    """Release reservation holds (one reservation or a whole cart) when their Redis mirrors expire (queued with eta=expires_at)"""
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for reservation_id in reservation_ids:
+            pipe.pttl(hold_key(reservation_id))
+        remaining_ms = max(pipe.execute())
+    except Exception:
+        remaining_ms = -2  # Redis unavailable - Postgres expires_at decides
+    if remaining_ms > 0:
+        # Delivered early (clock skew); come back when the keys expire
+        raise self.retry(countdown=remaining_ms / 1000, max_retries=None)
+    
     db = SessionLocal()
     try:
-        now = datetime.utcnow()
-        
-        # Find expired pending reservations with slot relationship loaded
-        expired = db.query(Reservation).options(
-            joinedload(Reservation.slot)
-        ).filter(
-            Reservation.status == ReservationStatus.PENDING,
-            Reservation.expires_at < now
+        released = db.execute(
+            update(Reservation).where(
+                Reservation.id.in_([uuid.UUID(reservation_id) for reservation_id in reservation_ids]),
+                Reservation.status == ReservationStatus.PENDING,
+                Reservation.expires_at <= datetime.utcnow()
+            ).values(status=ReservationStatus.CANCELLED).returning(Reservation.slot_id).execution_options(
+                synchronize_session=False
+            )
         ).all()
+        if not released:
+            # Paid, cancelled, already expired by the beat scan, or not yet due
+            db.rollback()
+            return {"released": 0}
         
-        for reservation in expired:
-            reservation.status = ReservationStatus.CANCELLED
-            if reservation.slot:
-                reservation.slot.status = SlotStatus.OPEN
-        
+        reopened = []
+        slot_ids = [row.slot_id for row in released if row.slot_id is not None]
+        if slot_ids:
+            reopened = db.execute(
+                update(Slot).where(
+                    Slot.id.in_(slot_ids),
+                    Slot.status == SlotStatus.HELD
+                ).values(status=SlotStatus.OPEN).returning(Slot.court_id, Slot.start_ts).execution_options(
+                    synchronize_session=False
+                )
+            ).all()
         db.commit()
-        
-        if expired:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"Expired {len(expired)} pending reservations")
-        
-        return {"expired_count": len(expired)}
+        mark_slots_sync(reopened, available=True)
+        return {"released": len(released)}
     
     except Exception as e:
         db.rollback()
         import logging
         logger = logging.getLogger(__name__)
-        logger.error(f"Error expiring reservations: {e}")
-        return {"error": str(e), "expired_count": 0}
+        logger.error(f"Error releasing holds for reservations {reservation_ids}: {e}")
+        return {"error": str(e), "released": 0}
     finally:
         db.close()
 
+def _expire_chunk(db: Session, now: datetime, limit: int):
+    """Cancel up to `limit` due reservations and reopen their held slots; returns (expired rows, reopened slots)"""
+    # Rows locked by a concurrent run (or a webhook settling them) are skipped, not waited on
+    due = select(Reservation.id).where(
+        Reservation.status == ReservationStatus.PENDING,
+        Reservation.expires_at < now
+    ).order_by(Reservation.expires_at).limit(limit).with_for_update(skip_locked=True)
+    
+    expired = db.execute(
+        update(Reservation).where(
+            Reservation.id.in_(due.scalar_subquery())
+        ).values(status=ReservationStatus.CANCELLED).returning(
+            Reservation.slot_id, Reservation.expires_at
+        ).execution_options(synchronize_session=False)
+    ).all()
+    
+    slot_ids = [row.slot_id for row in expired if row.slot_id is not None]
+    reopened = []
+    if slot_ids:
+        # Only this chunk's reservations hold these slots, so waiting on their row locks is brief
+        reopened = db.execute(
+            update(Slot).where(
+                Slot.id.in_(slot_ids),
+                Slot.status == SlotStatus.HELD
+            ).values(status=SlotStatus.OPEN).returning(
+                Slot.court_id, Slot.start_ts
+            ).execution_options(synchronize_session=False)
+        ).all()
+    db.commit()
+    return expired, reopened
+
+@shared_task
+def expire_pending_reservations():
+    """Expire pending reservations that have passed their TTL (safety net for release_hold)"""
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    db = SessionLocal()
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    metrics = {"expired_count": 0, "slots_reopened": 0, "chunks": 0, "max_lag_seconds": 0.0}
+    try:
+        # One short transaction per chunk, so a backlog never becomes one huge transaction
+        while True:
+            expired, reopened = _expire_chunk(db, now, settings.HOLD_EXPIRY_CHUNK_SIZE)
+            if not expired:
+                break
+            mark_slots_sync(reopened, available=True)
+            
+            metrics["chunks"] += 1
+            metrics["expired_count"] += len(expired)
+            metrics["slots_reopened"] += len(reopened)
+            oldest = min(_naive_utc(row.expires_at) for row in expired)
+            metrics["max_lag_seconds"] = max(metrics["max_lag_seconds"], round((now - oldest).total_seconds(), 1))
+            if len(expired) < settings.HOLD_EXPIRY_CHUNK_SIZE:
+                break
+        
+        metrics["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if metrics["expired_count"]:
+            # Anything found here was missed by release_hold
+            logger.warning(f"Expired {metrics['expired_count']} pending reservations in safety-net scan: {metrics}")
+        else:
+            logger.info(f"Reservation expiry scan: {metrics}")
+        return metrics
+    
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error expiring reservations: {e}")
+        metrics["error"] = str(e)
+        return metrics
+    finally:
+        db.close()
@@ -0,0 +1,112 @@
+from celery import shared_task
+from sqlalchemy import column, exists, select, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+from app.core.database import SessionLocal
+from app.core.availability import mark_slots_sync
+from app.core.config import settings
+from app.models.venue import Slot, SlotStatus, SlotTemplate
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from zoneinfo import ZoneInfo
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+def _local_to_utc(day: date, minutes: int, tz: ZoneInfo):
+    """UTC instant of a venue-local wall time, or None if the wall time does not exist (DST gap)"""
+    local = datetime.combine(day, datetime.min.time(), tzinfo=tz) + timedelta(minutes=minutes)
+    utc = local.astimezone(timezone.utc)
+    if utc.astimezone(tz).replace(tzinfo=None) != local.replace(tzinfo=None):
+        return None
+    return utc
+
+def expand_template(court_id, bands, from_date: date, to_date: date):
+    """Slot rows for every band occurrence in [from_date, to_date], in start order"""
+    by_weekday = {}
+    for band in bands:
+        by_weekday.setdefault(band.weekday, []).append(band)
+    for weekday_bands in by_weekday.values():
+        weekday_bands.sort(key=lambda band: band.start_time)
+
+    day = from_date
+    while day <= to_date:
+        for band in by_weekday.get(day.weekday(), []):
+            tz = ZoneInfo(band.timezone)
+            start = band.start_time.hour * 60 + band.start_time.minute
+            end = band.end_time.hour * 60 + band.end_time.minute or 24 * 60
+            while start + band.slot_minutes <= end:
+                start_ts = _local_to_utc(day, start, tz)
+                end_ts = _local_to_utc(day, start + band.slot_minutes, tz)
+                if start_ts is not None and end_ts is not None:
+                    yield {
+                        "id": uuid.uuid4(),
+                        "court_id": court_id,
+                        "start_ts": start_ts,
+                        "end_ts": end_ts,
+                        "price_cents": band.price_cents,
+                        "currency": band.currency,
+                        "status": SlotStatus.OPEN,
+                    }
+                start += band.slot_minutes
+        day += timedelta(days=1)
+
+SLOT_COLUMNS = ("id", "court_id", "start_ts", "end_ts", "price_cents", "currency", "status")
+
+def insert_free_slots(chunk):
+    """INSERT the candidate rows that do not overlap any existing slot on their court"""
+    candidate = values(
+        *(column(name, Slot.__table__.c[name].type) for name in SLOT_COLUMNS),
+        name="candidate"
+    ).data([tuple(row[name] for name in SLOT_COLUMNS) for row in chunk])
+    existing = aliased(Slot)
+    free = select(candidate).where(~exists().where(
+        existing.court_id == candidate.c.court_id,
+        existing.start_ts < candidate.c.end_ts,
+        existing.end_ts > candidate.c.start_ts
+    ))
+    # The conflict clause covers a concurrent insert of the exact same slot
+    return insert(Slot).from_select(SLOT_COLUMNS, free).on_conflict_do_nothing(
+        constraint="uq_slot_court_time"
+    ).returning(Slot.court_id, Slot.start_ts)
+
+@shared_task(bind=True)
+def generate_slots_from_template(self, court_id: str, from_date: str, to_date: str):
+    """Expand a court's weekly template into slots, in chunked bulk inserts"""
+    db = SessionLocal()
+    try:
+        court_uuid = uuid.UUID(court_id)
+        start_day, end_day = date.fromisoformat(from_date), date.fromisoformat(to_date)
+        bands = db.query(SlotTemplate).filter(SlotTemplate.court_id == court_uuid).all()
+        total = sum(1 for _ in expand_template(court_uuid, bands, start_day, end_day))
+
+        inserted = 0
+        processed = 0
+        rows = expand_template(court_uuid, bands, start_day, end_day)
+        while True:
+            chunk = list(islice(rows, settings.SLOT_GENERATION_CHUNK_SIZE))
+            if not chunk:
+                break
+            # Candidates overlapping an existing slot are skipped, so re-running a range (or
+            # generating over hand-made or differently-sized slots) never double-books a court
+            created = db.execute(insert_free_slots(chunk)).all()
+            db.commit()
+            mark_slots_sync(created, available=True)
+
+            inserted += len(created)
+            processed += len(chunk)
+            self.update_state(
+                state="PROGRESS",
+                meta={"inserted": inserted, "skipped": processed - inserted, "total": total}
+            )
+
+        logger.info(f"Generated {inserted} slots for court {court_id} ({processed - inserted} overlapped existing slots)")
+        return {"inserted": inserted, "skipped": processed - inserted, "total": total}
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error generating slots for court {court_id}: {e}")
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,39 @@
+"""Availability bitmaps hold exactly one bit per open slot"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.core import availability
+from app.core.redis_client import redis_client
+from app.models.venue import Slot, SlotStatus
+from tests.conftest import requires_db
+
+pytestmark = requires_db
+
+def _open_slot(db, court, start):
+    slot = Slot(
+        court_id=court.id,
+        start_ts=start,
+        end_ts=start + timedelta(minutes=5),
+        price_cents=1000,
+        currency="USD",
+        status=SlotStatus.OPEN
+    )
+    db.add(slot)
+    db.commit()
+    return slot
+
+def test_court_day_with_slots_sharing_a_unit_is_not_indexed(db, court):
+    day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    _open_slot(db, court, day + timedelta(hours=9))
+    _open_slot(db, court, day + timedelta(hours=9, minutes=5))  # same 15-minute unit
+    _open_slot(db, court, day + timedelta(days=1, hours=9))
+
+    availability.rebuild_index(db, 3)
+
+    assert not redis_client.exists(availability.bitmap_key(court.id, day.date()))
+    aligned_day = availability.bitmap_key(court.id, (day + timedelta(days=1)).date())
+    assert redis_client.bitcount(aligned_day) == 1
+
+    # An unaligned start showing up later drops its court-day too
+    availability.mark_slots_sync([(court.id, day + timedelta(days=1, hours=10, minutes=5))], available=True)
+    assert not redis_client.exists(aligned_day)
@@ -0,0 +1,69 @@
+"""Multi-slot cart holds"""
+
+from datetime import datetime, timedelta
+
+from app.models.booking import Reservation, ReservationStatus
+from app.models.venue import Slot, SlotStatus
+from tests.conftest import auth_headers, requires_db
+
+pytestmark = requires_db
+
+def _second_slot(db, slot):
+    other = Slot(
+        court_id=slot.court_id,
+        start_ts=slot.start_ts + timedelta(hours=2),
+        end_ts=slot.end_ts + timedelta(hours=2),
+        price_cents=slot.price_cents,
+        currency=slot.currency,
+        status=SlotStatus.OPEN
+    )
+    db.add(other)
+    db.commit()
+    return other
+
+async def test_cart_schedules_one_release_for_all_its_holds(client, db, organizer, open_slot, monkeypatch):
+    from app.celery_app import celery_app
+    from app.core.holds import RELEASE_TASK
+
+    other = _second_slot(db, open_slot)
+    sent = []
+    monkeypatch.setattr(celery_app, "send_task", lambda name, **kwargs: sent.append((name, kwargs)))
+
+    response = await client.post(
+        "/api/v1/venues/reservations/cart",
+        json={"slot_ids": [str(open_slot.id), str(other.id)], "actor_type": "individual"},
+        headers=auth_headers(organizer)
+    )
+    assert response.status_code == 201, response.text
+    reservation_ids = sorted(reservation["id"] for reservation in response.json()["reservations"])
+    assert len(reservation_ids) == 2
+
+    assert len(sent) == 1
+    name, kwargs = sent[0]
+    assert name == RELEASE_TASK
+    assert sorted(kwargs["args"]) == reservation_ids
+
+def test_release_hold_releases_the_whole_cart(db, organizer, open_slot):
+    from app.models.booking import ActorType
+    from app.tasks.reservations import release_hold
+
+    other = _second_slot(db, open_slot)
+    reservations = []
+    for slot in (open_slot, other):
+        slot.status = SlotStatus.HELD
+        reservation = Reservation(
+            slot_id=slot.id,
+            booked_by_user_id=organizer.id,
+            actor_type=ActorType.INDIVIDUAL,
+            status=ReservationStatus.PENDING,
+            expires_at=datetime.utcnow() - timedelta(seconds=1)
+        )
+        db.add(reservation)
+        reservations.append(reservation)
+    db.commit()
+
+    assert release_hold.run(*(str(reservation.id) for reservation in reservations)) == {"released": 2}
+
+    db.expire_all()
+    assert {reservation.status for reservation in reservations} == {ReservationStatus.CANCELLED}
+    assert {db.get(Slot, slot.id).status for slot in (open_slot, other)} == {SlotStatus.OPEN}
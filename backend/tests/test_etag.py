@@ -0,0 +1,40 @@
+"""Conditional GET validators"""
+
+import uuid
+
+from tests.conftest import requires_db
+
+pytestmark = requires_db
+
+async def _version_exists(scope):
+    from app.core.redis_client import get_async_redis
+
+    return bool(await get_async_redis().exists(f"resource_version:{scope}"))
+
+async def test_unknown_resource_writes_nothing_and_never_matches(client):
+    share_token = f"missing-{uuid.uuid4().hex}"
+    for _ in range(2):
+        response = await client.get(f"/api/v1/formations/formations/{share_token}", headers={"If-None-Match": "*"})
+        assert response.json() == {"detail": "Formation not found"}
+        assert "ETag" not in response.headers
+    assert not await _version_exists(f"formation:{share_token}")
+
+    venue_id = uuid.uuid4()
+    response = await client.get(f"/api/v1/venues/{venue_id}/courts", headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert response.json() == []
+    assert not await _version_exists(f"venue:{venue_id}")
+
+async def test_court_write_invalidates_sport_filtered_venues(client, court):
+    from app.core.etag import bump_versions
+
+    await bump_versions("venues", "courts")
+    url = "/api/v1/venues/?sport=football"
+    # First read seeds the versions, the second one carries the validator
+    assert "ETag" not in (await client.get(url)).headers
+    etag = (await client.get(url)).headers["ETag"]
+    assert (await client.get(url, headers={"If-None-Match": etag})).status_code == 304
+
+    await bump_versions("courts", f"venue:{court.venue_id}")
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
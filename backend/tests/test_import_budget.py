@@ -0,0 +1,11 @@
+"""Cold-start import budgets (scripts/bench_import_time.py)"""
+
+import os
+import subprocess
+import sys
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts", "bench_import_time.py")
+
+def test_import_budgets():
+    proc = subprocess.run([sys.executable, SCRIPT, "--top", "5"], capture_output=True, text=True, timeout=300)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
@@ -0,0 +1,55 @@
+"""Payment webhook outcomes when a unique constraint trips"""
+
+import uuid
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.booking import ActorType, Reservation, ReservationStatus
+from app.models.payment import Payment, PaymentEvent, PaymentStatus
+from tests.conftest import requires_db
+
+pytestmark = requires_db
+
+def _reservation(db, slot, user, status):
+    reservation = Reservation(slot_id=slot.id, booked_by_user_id=user.id, actor_type=ActorType.INDIVIDUAL, status=status)
+    db.add(reservation)
+    db.flush()
+    return reservation
+
+async def test_payment_for_an_already_paid_slot_is_flagged_for_refund(client, db, organizer, admin, open_slot):
+    _reservation(db, open_slot, admin, ReservationStatus.PAID)
+    late = _reservation(db, open_slot, organizer, ReservationStatus.PENDING)
+    provider_ref = f"pay_{uuid.uuid4().hex}"
+    payment = Payment(provider="test", provider_ref=provider_ref, amount_cents=5000, reservation_id=late.id)
+    db.add(payment)
+    db.commit()
+    payment_id = payment.id
+    event_id = f"evt_{uuid.uuid4().hex}"
+
+    response = await client.post(
+        "/api/v1/payments/webhook",
+        json={"id": event_id, "payment_id": provider_ref, "type": "payment.succeeded"},
+        headers={"X-Payment-Provider": "test"}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "refund_pending"
+
+    db.expire_all()
+    assert db.get(Payment, payment_id).status == PaymentStatus.REFUND_PENDING
+    event = db.query(PaymentEvent).filter(PaymentEvent.provider_event_id == event_id).one()
+    assert event.payment_id == payment_id
+    assert db.get(Reservation, late.id).status == ReservationStatus.PENDING
+
+async def test_duplicate_event_is_reported_by_constraint_name(schema):
+    from app.api.v1.payments import _constraint_name
+    from app.core.database import async_session
+
+    event_id = f"evt_{uuid.uuid4().hex}"
+    async with async_session() as db:
+        db.add(PaymentEvent(provider="test", provider_event_id=event_id, payload_json={}))
+        await db.commit()
+        db.add(PaymentEvent(provider="test", provider_event_id=event_id, payload_json={}))
+        with pytest.raises(IntegrityError) as error:
+            await db.commit()
+    assert _constraint_name(error.value) == "uq_payment_event_provider_id"
@@ -0,0 +1,110 @@
+"""Per-endpoint SQL query budgets (QUERY_BUDGET_ROUTES) as regression tests"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.core.query_stats import assert_max_queries
+from tests.conftest import auth_headers, requires_db
+
+pytestmark = requires_db
+
+async def test_create_reservation_query_budget(client, organizer, open_slot):
+    headers = auth_headers(organizer)
+    await client.get("/api/v1/venues/reservations/my", headers=headers)  # warm the principal cache
+
+    with assert_max_queries(settings.QUERY_BUDGET_ROUTES["POST /api/v1/venues/reservations"]):
+        response = await client.post(
+            "/api/v1/venues/reservations",
+            json={"slot_id": str(open_slot.id), "actor_type": "individual"},
+            headers=headers
+        )
+    assert response.status_code == 201, response.text
+    assert response.json()["slot_id"] == str(open_slot.id)
+
+async def test_organize_event_query_budget(client, organizer, open_slot):
+    headers = auth_headers(organizer)
+    await client.get("/api/v1/venues/reservations/my", headers=headers)
+
+    with assert_max_queries(settings.QUERY_BUDGET_ROUTES["POST /api/v1/events/organize"]):
+        response = await client.post(
+            "/api/v1/events/organize",
+            json={
+                "sport": "football",
+                "match_format": "5x5",
+                "players_per_team": 5,
+                "total_players": 10,
+                "event_type": "friendly_match",
+                "event_date": open_slot.start_ts.isoformat(),
+                "slot_id": str(open_slot.id),
+            },
+            headers=headers
+        )
+    assert response.status_code == 201, response.text
+
+async def test_create_match_event_query_budget(client, db, admin, open_slot):
+    from app.models.booking import Reservation, ReservationStatus, ActorType
+    from app.models.match import Match, MatchStatus
+
+    reservation = Reservation(
+        slot_id=open_slot.id,
+        booked_by_user_id=admin.id,
+        actor_type=ActorType.INDIVIDUAL,
+        status=ReservationStatus.PAID
+    )
+    db.add(reservation)
+    db.flush()
+    match = Match(reservation_id=reservation.id, sport="football", status=MatchStatus.LIVE)
+    db.add(match)
+    db.commit()
+
+    headers = auth_headers(admin)
+    await client.get("/api/v1/venues/reservations/my", headers=headers)
+
+    with assert_max_queries(settings.QUERY_BUDGET_ROUTES["POST /api/v1/matches/{match_id}/events"]):
+        response = await client.post(
+            f"/api/v1/matches/{match.id}/events",
+            json={"seq": 1, "ts": datetime.now(timezone.utc).isoformat(), "type": "goal", "payload": {"team": "home"}},
+            headers=headers
+        )
+    assert response.status_code == 201, response.text
+
+def test_failed_statement_does_not_leak_start_time(schema):
+    from sqlalchemy import text
+    from sqlalchemy.exc import ProgrammingError
+    from app.core.database import engine
+
+    with engine.connect() as conn:
+        with pytest.raises(ProgrammingError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info.get("query_start") == []
+
+async def test_final_match_event_log_is_one_query_then_cached(client, db, admin, open_slot):
+    from app.models.booking import Reservation, ReservationStatus, ActorType
+    from app.models.match import Match, MatchStatus, MatchEvent
+
+    reservation = Reservation(
+        slot_id=open_slot.id,
+        booked_by_user_id=admin.id,
+        actor_type=ActorType.INDIVIDUAL,
+        status=ReservationStatus.PAID
+    )
+    db.add(reservation)
+    db.flush()
+    match = Match(reservation_id=reservation.id, sport="football", status=MatchStatus.FINAL)
+    db.add(match)
+    db.flush()
+    db.add(MatchEvent(match_id=match.id, seq=1, ts=datetime.now(timezone.utc), type="goal", payload_json={}, created_by_user_id=admin.id))
+    db.commit()
+    url = f"/api/v1/matches/{match.id}/events"
+
+    with assert_max_queries(1):
+        response = await client.get(url)
+    assert response.status_code == 200, response.text
+    assert [event["seq"] for event in response.json()] == [1]
+    assert "match_status" not in response.json()[0]
+
+    with assert_max_queries(0):
+        cached = await client.get(url)
+    assert cached.content == response.content
@@ -0,0 +1,62 @@
+"""Template expansion never double-books a court"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.models.venue import Slot, SlotStatus
+from app.tasks.slots import insert_free_slots
+from tests.conftest import requires_db
+
+pytestmark = requires_db
+
+def _candidate(court, start, minutes):
+    return {
+        "id": uuid.uuid4(),
+        "court_id": court.id,
+        "start_ts": start,
+        "end_ts": start + timedelta(minutes=minutes),
+        "price_cents": 5000,
+        "currency": "USD",
+        "status": SlotStatus.OPEN,
+    }
+
+def test_candidates_overlapping_existing_slots_are_skipped(db, open_slot):
+    court = open_slot.court
+    start = open_slot.start_ts
+    candidates = [
+        _candidate(court, start - timedelta(minutes=30), 60),  # runs into the existing slot
+        _candidate(court, start + timedelta(minutes=30), 90),  # starts inside it
+        _candidate(court, start + timedelta(hours=2), 60),     # free
+    ]
+
+    created = db.execute(insert_free_slots(candidates)).all()
+    db.commit()
+
+    assert [row.start_ts for row in created] == [start + timedelta(hours=2)]
+    assert db.query(Slot).filter(Slot.court_id == court.id).count() == 2
+
+async def test_generation_job_is_visible_to_the_court_owner_only(client, db, court, venue_owner):
+    from app.api.v1.schedules import JOB_COURT_KEY
+    from app.core.redis_client import get_async_redis
+    from app.models.user import UserRole
+    from tests.conftest import auth_headers, make_user
+
+    task_id = str(uuid.uuid4())
+    await get_async_redis().set(JOB_COURT_KEY.format(task_id), str(court.id), ex=60)
+    other_owner = make_user(db, UserRole.VENUE_OWNER)
+
+    response = await client.get(f"/api/v1/schedules/jobs/{task_id}", headers=auth_headers(other_owner))
+    assert response.status_code == 403
+    response = await client.get(f"/api/v1/schedules/jobs/{uuid.uuid4()}", headers=auth_headers(venue_owner))
+    assert response.status_code == 404
+
+async def test_template_slot_starts_must_align_to_the_availability_index(client, court, venue_owner):
+    from tests.conftest import auth_headers
+
+    band = {"weekday": 0, "start_time": "09:00", "end_time": "12:00", "slot_minutes": 60, "price_cents": 5000}
+    url = f"/api/v1/schedules/courts/{court.id}/template"
+    for unaligned in ({"slot_minutes": 50}, {"start_time": "09:10"}):
+        response = await client.put(url, json={"bands": [{**band, **unaligned}]}, headers=auth_headers(venue_owner))
+        assert response.status_code == 400, response.text
+    response = await client.put(url, json={"bands": [band]}, headers=auth_headers(venue_owner))
+    assert response.status_code == 200, response.text
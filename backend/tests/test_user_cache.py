@@ -0,0 +1,64 @@
+"""Cross-worker invalidation of the per-process principal cache"""
+
+import asyncio
+import uuid
+
+from app.core import user_cache
+from app.models.user import UserRole
+from tests.conftest import auth_headers, requires_db
+
+pytestmark = requires_db
+
+async def test_published_invalidation_evicts_local_entry():
+    user_id = uuid.uuid4()
+    principal = user_cache.Principal(id=user_id, role=UserRole.ORGANIZER, verified_phone=True, verified_email=False)
+    subscriber = user_cache.InvalidationSubscriber()
+    subscriber.start()
+    try:
+        await asyncio.sleep(0.2)  # let the subscription register
+        user_cache._local_cache.set(user_id, principal, ttl_seconds=60)
+        # What another worker's invalidate_user sends
+        await user_cache.get_async_redis().publish(user_cache.INVALIDATION_CHANNEL, str(user_id))
+        for _ in range(20):
+            if user_cache._local_cache.get(user_id) is None:
+                break
+            await asyncio.sleep(0.05)
+        assert user_cache._local_cache.get(user_id) is None
+    finally:
+        await subscriber.stop()
+
+async def test_refill_started_before_invalidation_is_dropped(organizer):
+    from app.core.database import async_session
+
+    await user_cache.invalidate_user(organizer.id)
+    async with async_session() as session:
+        execute = session.execute
+
+        async def execute_then_invalidate(*args, **kwargs):
+            # The row is read, then a concurrent role change commits and invalidates
+            result = await execute(*args, **kwargs)
+            await user_cache.invalidate_user(organizer.id)
+            return result
+
+        session.execute = execute_then_invalidate
+        principal = await user_cache.get_principal(organizer.id, session)
+
+    assert principal.id == organizer.id
+    assert await user_cache.get_async_redis().get(user_cache._redis_key(organizer.id)) is None
+    assert user_cache._local_cache.get(organizer.id) is None
+
+async def test_role_change_invalidates_cached_principal(client, organizer, admin):
+    from app.core.database import async_session
+
+    async with async_session() as session:
+        assert (await user_cache.get_principal(organizer.id, session)).role == UserRole.ORGANIZER
+
+    response = await client.patch(
+        f"/api/v1/admin/users/{organizer.id}/role",
+        json={"role": "referee"},
+        headers=auth_headers(admin)
+    )
+    assert response.status_code == 200, response.text
+
+    async with async_session() as session:
+        assert (await user_cache.get_principal(organizer.id, session)).role == UserRole.REFEREE
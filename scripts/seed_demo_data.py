@@ -22,6 +22,7 @@ from app.core.database import SessionLocal, engine
 from app.models.user import User, UserRole
 from app.models.venue import Venue, Court, Slot, SlotStatus
 from app.core.database import Base
+from app.core.etag import bump_versions_sync
 
 def seed_data():
     """Seed minimal demo data"""
@@ -114,6 +115,7 @@ def seed_data():
         
         db.commit()
         db.refresh(court)
+        bump_versions_sync("venues", "courts", f"venue:{venue.id}")
         
         # Create slots for next 5 days
         now = datetime.utcnow()